@@ -0,0 +1,104 @@
+"""
+On-Disk Cache for Graph Memory
+SQLite-backed key-value store for cross-run memoization
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+CACHE_DIR = ".cache"
+
+
+class DiskCache:
+    """
+    Minimal persistent key-value cache with optional expiry
+
+    Values are stored as JSON, so cached objects must be JSON-safe
+    (use to_dict() on result dataclasses before caching). Backed by
+    SQLite rather than an extra dependency; one file per cache keeps
+    unrelated caches from contending on the same database.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+            self._conn.commit()
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if absent or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            with self._lock:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+            return None
+        return json.loads(value)
+
+    def add(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        """Store the value only if the key is absent (or expired)
+
+        Returns True when this call stored the value. The primary-key
+        constraint makes the insert atomic across threads and processes,
+        so a short-TTL add() doubles as a lease/lock primitive.
+        """
+        expires_at = time.time() + expire if expire else None
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key = ? AND expires_at IS NOT NULL "
+                "AND expires_at < ?",
+                (key, time.time())
+            )
+            try:
+                self._conn.execute(
+                    "INSERT INTO cache (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, payload, expires_at)
+                )
+            except sqlite3.IntegrityError:
+                self._conn.commit()
+                return False
+            self._conn.commit()
+            return True
+
+    def delete(self, key: str) -> None:
+        """Drop a key; a no-op if it is absent"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        """Store a JSON-safe value, optionally expiring after `expire` seconds"""
+        expires_at = time.time() + expire if expire else None
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, payload, expires_at)
+            )
+            self._conn.commit()
+
+
+# Literature evidence is effectively deterministic per
+# (disease_area, intervention, comparator, model_type) tuple, so it is
+# memoized across runs; entries expire after a week
+literature_cache = DiskCache(os.path.join(CACHE_DIR, "literature.db"))
@@ -0,0 +1,132 @@
+"""
+Topology-Aware Delta Checkpointing
+Persists per-step channel deltas instead of full state snapshots
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+# Sentinel channel marking a checkpoint as a delta over its parent
+DELTA_MARKER = '__delta__'
+
+# A full snapshot is forced every N puts per thread so reconstruction
+# never walks an unbounded parent chain
+SNAPSHOT_EVERY = 20
+
+
+class DeltaCheckpointSaver:
+    """
+    Checkpointer wrapper that stores only the channels each super-step
+    wrote
+
+    LangGraph's step metadata records which node wrote which channels,
+    so the topology tells us the delta exactly: everything else is
+    unchanged since the parent checkpoint. Deltas are marked with
+    DELTA_MARKER and reconstructed on read by merging the parent chain
+    up to the nearest full snapshot. With large parameters /
+    literature_evidence payloads this shrinks the per-step checkpoint
+    row from the whole state to the handful of keys a node returned.
+
+    Wraps any BaseCheckpointSaver-compatible inner saver; unhandled
+    attributes (put_writes, get_next_version, ...) delegate straight
+    through.
+    """
+
+    def __init__(self, inner: Any):
+        self._inner = inner
+        # Puts since the last full snapshot, per thread
+        self._since_snapshot: Dict[str, int] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    @staticmethod
+    def _touched_channels(metadata: Optional[Dict[str, Any]]) -> set:
+        """Channels written this step, read from the step metadata"""
+        touched: set = set()
+        for update in ((metadata or {}).get('writes') or {}).values():
+            if isinstance(update, dict):
+                touched.update(update)
+        return touched
+
+    def put(self, config: Dict[str, Any], checkpoint: Dict[str, Any],
+            metadata: Optional[Dict[str, Any]] = None,
+            new_versions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        thread_id = str(config.get('configurable', {}).get('thread_id', ''))
+        touched = self._touched_channels(metadata)
+        values = checkpoint.get('channel_values') or {}
+        since = self._since_snapshot.get(thread_id, 0)
+
+        # Delta-encode only when the step declared its writes, there is
+        # a parent to diff against, and the snapshot cadence allows it
+        untouched = set(values) - touched
+        if touched and 0 < since < SNAPSHOT_EVERY and untouched:
+            delta = {k: v for k, v in values.items() if k in touched}
+            delta[DELTA_MARKER] = True
+            checkpoint = {**checkpoint, 'channel_values': delta}
+            self._since_snapshot[thread_id] = since + 1
+        else:
+            self._since_snapshot[thread_id] = 1
+
+        if new_versions is not None:
+            return self._inner.put(config, checkpoint, metadata, new_versions)
+        return self._inner.put(config, checkpoint, metadata)
+
+    def _reconstruct(self, tup: Any) -> Any:
+        """Merge a delta checkpoint with its parent chain on read"""
+        if tup is None:
+            return None
+        values = tup.checkpoint.get('channel_values') or {}
+        if DELTA_MARKER not in values:
+            return tup
+
+        layers = [values]
+        parent = tup.parent_config
+        while parent is not None:
+            ptup = self._inner.get_tuple(parent)
+            if ptup is None:
+                break
+            pvalues = ptup.checkpoint.get('channel_values') or {}
+            layers.append(pvalues)
+            if DELTA_MARKER not in pvalues:
+                break
+            parent = ptup.parent_config
+
+        merged: Dict[str, Any] = {}
+        for layer in reversed(layers):
+            merged.update(layer)
+        merged.pop(DELTA_MARKER, None)
+        tup.checkpoint['channel_values'] = merged
+        return tup
+
+    def get_tuple(self, config: Dict[str, Any]) -> Any:
+        return self._reconstruct(self._inner.get_tuple(config))
+
+    def get(self, config: Dict[str, Any]) -> Any:
+        tup = self.get_tuple(config)
+        return tup.checkpoint if tup is not None else None
+
+    def list(self, config: Optional[Dict[str, Any]], **kwargs: Any):
+        for tup in self._inner.list(config, **kwargs):
+            yield self._reconstruct(tup)
+
+    # Async facade: the graph runs under ainvoke, and the inner saver's
+    # own a* methods would bypass the delta encoding, so these route the
+    # async path through the wrapper on a worker thread
+
+    async def aput(self, config, checkpoint, metadata=None, new_versions=None):
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def aget(self, config):
+        return await asyncio.to_thread(self.get, config)
+
+    async def alist(self, config, **kwargs):
+        for tup in await asyncio.to_thread(lambda: list(self.list(config, **kwargs))):
+            yield tup
+
+    async def aput_writes(self, *args: Any, **kwargs: Any):
+        return await asyncio.to_thread(self._inner.put_writes, *args, **kwargs)
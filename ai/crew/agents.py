@@ -2,18 +2,98 @@
 CrewAI Agents for Health Economics Analysis
 Defines specialized agents for different tasks
 """
-from crewai import Agent
-from typing import Optional
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from crewai import Agent, LLM
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _configure_shared_transport() -> None:
+    """
+    Point litellm (CrewAI's transport layer) at shared pooled HTTP
+    clients
+
+    Without this, concurrent task kickoffs — the parallel DSA/PSA
+    branches in particular — each open fresh connections and pay a TLS
+    handshake per call. A single keepalive pool multiplexes all agent
+    traffic; HTTP/2 is enabled when the h2 extra is installed.
+    """
+    try:
+        import httpx
+        import litellm
+    except ImportError:  # pragma: no cover - litellm ships with crewai
+        return
+
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    try:
+        client = httpx.Client(http2=True, limits=limits)
+        aclient = httpx.AsyncClient(http2=True, limits=limits)
+    except ImportError:
+        # h2 not installed; HTTP/1.1 keepalive pooling still applies
+        client = httpx.Client(limits=limits)
+        aclient = httpx.AsyncClient(limits=limits)
+    if getattr(litellm, 'client_session', None) is None:
+        litellm.client_session = client
+    if getattr(litellm, 'aclient_session', None) is None:
+        litellm.aclient_session = aclient
+
+
+@lru_cache(maxsize=1)
+def _shared_llm() -> Optional["LLM"]:
+    """
+    Single LLM client shared by every agent
+
+    All agents talk to the same provider, and their prompts share the
+    CrewAI boilerplate prefix (tool schemas, format instructions).
+    Routing them through one client with provider prompt caching means
+    that shared prefix is prefilled once and served from the KV cache on
+    subsequent calls: Anthropic needs the prompt-caching beta header,
+    OpenAI caches common prefixes automatically. Returns None when no
+    provider is configured, which leaves CrewAI's default resolution
+    in place.
+    """
+    from crewai import LLM
+    from config import settings
+
+    _configure_shared_transport()
+
+    if settings.ANTHROPIC_API_KEY:
+        return LLM(
+            model=f"anthropic/{settings.ANTHROPIC_MODEL}",
+            extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"},
+        )
+    if settings.OPENAI_API_KEY:
+        return LLM(model=f"openai/{settings.OPENAI_MODEL}")
+    return None
 
 
 class HealthEconAgents:
-    """Factory class for creating specialized health economics agents"""
-    
+    """
+    Factory class for creating specialized health economics agents
+
+    Each factory is memoized with lru_cache so repeated pipeline runs
+    reuse a single Agent instance instead of re-running CrewAI's
+    construction work (LLM client wiring, prompt template compilation)
+    on every task. Agents that need tools receive them here at
+    construction, from the equally memoized HealthEconTools factories.
+    Callers must not mutate the returned agents.
+    """
+
     @staticmethod
+    @lru_cache(maxsize=1)
     def query_parser_agent() -> Agent:
         """
         Agent specialized in parsing user queries and extracting requirements
         """
+        from crewai import Agent
+
         return Agent(
             role="Health Economics Query Parser",
             goal="Extract structured information from user queries about health economic analyses",
@@ -22,16 +102,22 @@ class HealthEconAgents:
             vague requirements and translating them into concrete modeling specifications. 
             You can identify disease areas, interventions, comparators, and suggest 
             appropriate model types.""",
-            verbose=True,
+            llm=_shared_llm(),
+            verbose=logger.isEnabledFor(logging.DEBUG),
             allow_delegation=False,
             max_iter=3
         )
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def literature_researcher_agent() -> Agent:
         """
         Agent specialized in finding and synthesizing literature evidence
         """
+        from crewai import Agent
+
+        from .tools import HealthEconTools
+
         return Agent(
             role="Clinical Literature Researcher",
             goal="Find high-quality evidence for model parameters from published literature",
@@ -40,16 +126,23 @@ class HealthEconAgents:
             cost estimates, and transition probabilities. You can assess study quality and 
             provide parameter ranges with uncertainty estimates. You're familiar with major 
             health economics databases and guidelines.""",
-            verbose=True,
+            tools=[HealthEconTools.literature_search_tool()],
+            llm=_shared_llm(),
+            verbose=logger.isEnabledFor(logging.DEBUG),
             allow_delegation=False,
             max_iter=5
         )
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def model_builder_agent() -> Agent:
         """
         Agent specialized in building health economic model structures
         """
+        from crewai import Agent
+
+        from .tools import HealthEconTools
+
         return Agent(
             role="Health Economic Model Architect",
             goal="Design and build appropriate health economic model structures",
@@ -58,16 +151,23 @@ class HealthEconAgents:
             models. You know when each model type is appropriate, how to structure states, 
             define transitions, and incorporate time dependencies. You follow ISPOR-SMDM 
             modeling good practices.""",
-            verbose=True,
+            tools=[HealthEconTools.model_validation_tool()],
+            llm=_shared_llm(),
+            verbose=logger.isEnabledFor(logging.DEBUG),
             allow_delegation=False,
             max_iter=4
         )
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def parameter_validator_agent() -> Agent:
         """
         Agent specialized in validating model parameters
         """
+        from crewai import Agent
+
+        from .tools import HealthEconTools
+
         return Agent(
             role="Model Parameter Validator",
             goal="Validate model parameters for consistency, plausibility, and completeness",
@@ -76,16 +176,23 @@ class HealthEconAgents:
             plausibility (transition rates reasonable), and completeness (all required 
             parameters present). You identify violations of modeling best practices and 
             suggest corrections. You're thorough and detail-oriented.""",
-            verbose=True,
+            tools=[HealthEconTools.parameter_validation_tool()],
+            llm=_shared_llm(),
+            verbose=logger.isEnabledFor(logging.DEBUG),
             allow_delegation=False,
             max_iter=3
         )
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def analysis_executor_agent() -> Agent:
         """
         Agent specialized in running health economic analyses
         """
+        from crewai import Agent
+
+        from .tools import HealthEconTools
+
         return Agent(
             role="Health Economic Analysis Specialist",
             goal="Execute health economic analyses and interpret results",
@@ -94,16 +201,23 @@ class HealthEconAgents:
             and generate cost-effectiveness metrics. You understand discounting, QALY 
             calculations, ICER interpretation, and uncertainty analysis. You can explain 
             results clearly and identify key drivers.""",
-            verbose=True,
+            tools=[HealthEconTools.calculation_tool()],
+            llm=_shared_llm(),
+            verbose=logger.isEnabledFor(logging.DEBUG),
             allow_delegation=False,
             max_iter=5
         )
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def report_generator_agent() -> Agent:
         """
         Agent specialized in generating comprehensive reports
         """
+        from crewai import Agent
+
+        from .tools import HealthEconTools
+
         return Agent(
             role="Health Economics Report Writer",
             goal="Generate clear, comprehensive health economic analysis reports",
@@ -112,16 +226,21 @@ class HealthEconAgents:
             know how to structure CEA reports following guidelines like CHEERS. You explain 
             complex methods clearly, present results transparently, and discuss limitations 
             honestly. Your reports are publication-ready.""",
-            verbose=True,
+            tools=[HealthEconTools.report_generator_tool()],
+            llm=_shared_llm(),
+            verbose=logger.isEnabledFor(logging.DEBUG),
             allow_delegation=False,
             max_iter=4
         )
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def quality_assurance_agent() -> Agent:
         """
         Agent specialized in final quality checks
         """
+        from crewai import Agent
+
         return Agent(
             role="Health Economics QA Specialist",
             goal="Perform comprehensive quality assurance on health economic models",
@@ -129,16 +248,20 @@ class HealthEconAgents:
             economics. You review models for technical accuracy, face validity, internal 
             validity, and external validity. You check calculations, cross-validate results, 
             and compare to published benchmarks. You catch errors others miss.""",
-            verbose=True,
+            llm=_shared_llm(),
+            verbose=logger.isEnabledFor(logging.DEBUG),
             allow_delegation=False,
             max_iter=3
         )
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def ai_coordinator_agent() -> Agent:
         """
         Agent that coordinates other agents based on AI mode
         """
+        from crewai import Agent
+
         return Agent(
             role="AI Workflow Coordinator",
             goal="Coordinate agent activities based on AI assistance mode",
@@ -146,7 +269,8 @@ class HealthEconAgents:
             suggestions vs. take action. In AI-Assisted mode, you provide recommendations. 
             In AI-Augmented mode, you actively help with tasks. In AI-Automated mode, you 
             execute the full pipeline. You adapt your behavior to user preferences.""",
-            verbose=True,
+            llm=_shared_llm(),
+            verbose=logger.isEnabledFor(logging.DEBUG),
             allow_delegation=True,
             max_iter=2
         )
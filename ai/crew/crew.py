@@ -2,13 +2,114 @@
 Health Economics Crew Orchestration
 Coordinates agents and tasks for complete workflow
 """
-from crewai import Crew, Process
 from typing import Dict, Any, Optional
+import asyncio
+import functools
+import threading
+import hashlib
 import json
+import re
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements
+    orjson = None
 
 from .agents import HealthEconAgents
+from .results import (
+    ParseQueryResult, LiteratureResearchResult, BuildModelResult,
+    ValidationResult, BaseCaseResult, DSAResult, PSAResult, ReportResult
+)
 from .tasks import HealthEconTasks
-from .tools import HealthEconTools
+
+# Captures a fenced JSON object/array in one pass; agents usually wrap
+# their structured output in ```json blocks.
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```", re.DOTALL)
+
+# Delimits the NDJSON simulation stream in PSA task output
+_SIMULATIONS_RE = re.compile(r"<simulations>(.*?)</simulations>", re.DOTALL)
+
+
+def _psa_statistics(costs, qalys) -> Dict[str, Any]:
+    """
+    Compute PSA summary statistics from raw simulation samples
+
+    The LLM only returns incremental cost/QALY samples; mean ICER, 95%
+    credible interval, and the CEAC are computed here with vectorized
+    NumPy operations, which is both faster and numerically exact.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    qalys = np.asarray(qalys, dtype=np.float64)
+
+    if costs.size == 0 or qalys.size == 0:
+        return {'mean_icer': 0, 'credible_interval': [], 'ceac_data': {}}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        icers = costs / qalys
+
+    # CEAC: broadcast NMB over the WTP grid instead of looping per threshold
+    wtp_thresholds = np.linspace(0, 150000, 31)
+    nmb = qalys[:, None] * wtp_thresholds[None, :] - costs[:, None]
+    prob_ce = (nmb > 0).mean(axis=0)
+
+    return {
+        'mean_icer': float(np.mean(icers)),
+        'credible_interval': [
+            float(np.percentile(icers, 2.5)),
+            float(np.percentile(icers, 97.5))
+        ],
+        'ceac_data': {
+            'wtp_thresholds': wtp_thresholds.tolist(),
+            'prob_ce': prob_ce.tolist()
+        }
+    }
+
+
+def _iter_ndjson(block: str):
+    """Yield one dict per non-empty NDJSON line, skipping malformed lines"""
+    loads = orjson.loads if orjson is not None else json.loads
+    for line in block.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield loads(line)
+        except ValueError:
+            continue
+
+# Process-wide cache of task results keyed on (task, ai_mode, inputs).
+# LLM kickoff dominates the cost of every run_*_task, so identical repeat
+# queries are served from here without touching the model.
+_TASK_CACHE: Dict[str, Any] = {}
+
+
+def _cached_kickoff(func):
+    """
+    Memoize a run_*_task method on a content hash of its inputs
+
+    The key covers the task name, the crew's AI mode, and all call
+    arguments (serialized deterministically). Only successful results are
+    cached so transient LLM failures can be retried.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        payload = json.dumps(
+            {'task': func.__name__, 'mode': self.ai_mode, 'args': args, 'kwargs': kwargs},
+            sort_keys=True, default=str
+        )
+        key = hashlib.blake2b(payload.encode()).hexdigest()
+
+        cached = _TASK_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        result = func(self, *args, **kwargs)
+        if getattr(result, 'status', None) == 'success':
+            _TASK_CACHE[key] = result
+        return result
+    return wrapper
 
 
 class HealthEconCrew:
@@ -16,18 +117,87 @@ class HealthEconCrew:
     Orchestrates CrewAI agents and tasks for health economics analysis
     """
     
-    def __init__(self, ai_mode: str = "ai-assisted"):
+    def __init__(self, ai_mode: str = "ai-assisted", verbose: bool = False):
         """
         Initialize the crew with specified AI mode
         
         Args:
             ai_mode: One of 'ai-assisted', 'ai-augmented', 'ai-automated'
+            verbose: Echo CrewAI prompt/response traffic to stdout. Off by
+                default - the synchronous printing sits on the critical
+                path and slows long tasks when logs are piped.
         """
+        # crewai and the tool stack are imported lazily so that merely
+        # importing this module stays cheap for non-AI code paths.
+        from .tools import HealthEconTools
+
         self.ai_mode = ai_mode
+        self.verbose = verbose
         self.agents = HealthEconAgents()
         self.tools = HealthEconTools()
-        
-    def run_parse_query_task(self, user_query: str) -> Dict[str, Any]:
+
+        # Resolve agents once - the HealthEconAgents factories are memoized
+        # and attach each agent's tools at construction, so this reuses
+        # fully-wired Agent instances across pipeline runs without
+        # mutating the shared objects.
+        self._agents = {
+            'query_parser': self.agents.query_parser_agent(),
+            'literature_researcher': self.agents.literature_researcher_agent(),
+            'model_builder': self.agents.model_builder_agent(),
+            'parameter_validator': self.agents.parameter_validator_agent(),
+            'analysis_executor': self.agents.analysis_executor_agent(),
+            'report_generator': self.agents.report_generator_agent(),
+        }
+
+        # Pool of idle Crews per agent role. A kickoff borrows a Crew,
+        # runs it outside the lock and returns it afterwards, so
+        # concurrent tasks on the same role (DSA and PSA both use the
+        # analysis executor) overlap on separate Crew instances while
+        # sequential tasks still reuse a built Crew instead of paying
+        # Crew construction (agent re-validation, telemetry wiring) per
+        # call.
+        self._crews: Dict[str, list] = {}
+        self._crew_locks: Dict[str, threading.Lock] = {}
+
+        # Validation results keyed on a hash of (model_structure,
+        # model_type). When only parameters changed, the structural part
+        # of the last LLM validation still holds and parameters can be
+        # re-checked locally without another round-trip.
+        self._validation_cache: Dict[str, ValidationResult] = {}
+
+    def _kickoff(self, role: str, task) -> Any:
+        """
+        Run a single task on a pooled Crew for the given agent role
+
+        The lock covers only the pool borrow/return, never the kickoff
+        itself: concurrent callers on the same role each get their own
+        Crew instance over the shared agent, so their LLM round-trips
+        overlap instead of serializing behind one Crew.
+        """
+        lock = self._crew_locks.setdefault(role, threading.Lock())
+        with lock:
+            pool = self._crews.setdefault(role, [])
+            crew = pool.pop() if pool else None
+
+        if crew is None:
+            from crewai import Crew, Process
+
+            crew = Crew(
+                agents=[self._agents[role]],
+                tasks=[],
+                process=Process.sequential,
+                verbose=self.verbose
+            )
+
+        crew.tasks = [task]
+        try:
+            return crew.kickoff()
+        finally:
+            with lock:
+                self._crews[role].append(crew)
+
+    @_cached_kickoff
+    def run_parse_query_task(self, user_query: str) -> ParseQueryResult:
         """
         Parse user query and extract requirements
         
@@ -35,338 +205,366 @@ class HealthEconCrew:
             user_query: Natural language query from user
             
         Returns:
-            Structured requirements dictionary
+            Structured requirements result
         """
-        agent = self.agents.query_parser_agent()
-        task = HealthEconTasks.parse_query_task(agent, user_query, self.ai_mode)
-        
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = crew.kickoff()
-        
+        return self.run_parse_query_batch([user_query])[0]
+
+    def run_parse_query_batch(self, queries: list) -> list:
+        """
+        Parse several independent queries with a single LLM round-trip
+
+        Batching shares the agent backstory/system tokens across queries
+        and collapses N network round-trips into one.
+
+        Args:
+            queries: Natural language queries from users
+
+        Returns:
+            One ParseQueryResult per query, in order
+        """
+        if not queries:
+            return []
+
+        agent = self._agents['query_parser']
+        task = HealthEconTasks.parse_query_batch_task(agent, queries, self.ai_mode)
+
+        result = self._kickoff('query_parser', task)
+        text = result if isinstance(result, str) else str(result)
+
         # Parse result into structured format
         try:
-            if isinstance(result, str):
-                parsed = self._extract_json_from_text(result)
-            else:
-                parsed = result
-            
-            return {
-                'disease_area': parsed.get('disease_area', ''),
-                'intervention': parsed.get('intervention', ''),
-                'comparator': parsed.get('comparator', ''),
-                'model_type': parsed.get('model_type', 'decision_tree'),
-                'time_horizon': parsed.get('time_horizon', 10),
-                'perspective': parsed.get('perspective', 'healthcare_system'),
-                'project_name': parsed.get('project_name', 'Unnamed Project'),
-                'summary': parsed.get('summary', user_query),
-                'status': 'success'
-            }
+            parsed = self._extract_json_from_text(text)
+            items = parsed if isinstance(parsed, list) else [parsed]
+
+            return [
+                self._parse_query_fields(
+                    items[i] if i < len(items) and isinstance(items[i], dict) else {},
+                    query
+                )
+                for i, query in enumerate(queries)
+            ]
         except Exception as e:
-            return {
-                'status': 'error',
-                'error': str(e),
-                'raw_output': str(result)
-            }
+            return [
+                ParseQueryResult(status='error', error=str(e), raw_output=text)
+                for _ in queries
+            ]
+
+    @staticmethod
+    def _parse_query_fields(parsed: Dict[str, Any], user_query: str) -> ParseQueryResult:
+        """Map one parsed query object onto the structured result fields"""
+        return ParseQueryResult(
+            disease_area=parsed.get('disease_area', ''),
+            intervention=parsed.get('intervention', ''),
+            comparator=parsed.get('comparator', ''),
+            model_type=parsed.get('model_type', 'decision_tree'),
+            time_horizon=parsed.get('time_horizon', 10),
+            perspective=parsed.get('perspective', 'healthcare_system'),
+            project_name=parsed.get('project_name', 'Unnamed Project'),
+            summary=parsed.get('summary', user_query)
+        )
     
+    @_cached_kickoff
     def run_literature_research_task(self, disease_area: str, intervention: str,
-                                     comparator: str, model_type: str) -> Dict[str, Any]:
+                                     comparator: str, model_type: str) -> LiteratureResearchResult:
         """
         Research literature for parameter estimates
         
         Returns:
-            Dictionary with parameters, sources, and missing data
+            Result with parameters, sources, and missing data
         """
-        agent = self.agents.literature_researcher_agent()
-        
-        # Assign literature search tool
-        agent.tools = [self.tools.literature_search_tool()]
+        agent = self._agents['literature_researcher']
         
         task = HealthEconTasks.literature_research_task(
             agent, disease_area, intervention, comparator, model_type
         )
-        
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = crew.kickoff()
-        
+
+        result = self._kickoff('literature_researcher', task)
+        text = result if isinstance(result, str) else str(result)
+
         try:
-            parsed = self._extract_json_from_text(str(result))
-            return {
-                'parameters': parsed.get('parameters', {}),
-                'sources': parsed.get('sources', []),
-                'missing_parameters': parsed.get('missing_parameters', []),
-                'quality_assessment': parsed.get('quality', 'moderate'),
-                'status': 'success'
-            }
+            parsed = self._extract_json_from_text(text)
+            return LiteratureResearchResult(
+                parameters=parsed.get('parameters', {}),
+                sources=parsed.get('sources', []),
+                missing_parameters=parsed.get('missing_parameters', []),
+                quality_assessment=parsed.get('quality', 'moderate')
+            )
         except Exception as e:
-            return {
-                'status': 'error',
-                'error': str(e),
-                'parameters': {},
-                'sources': [],
-                'missing_parameters': []
-            }
+            return LiteratureResearchResult(status='error', error=str(e))
     
+    @_cached_kickoff
     def run_build_model_task(self, model_type: str, disease_area: str,
-                            parameters: Dict[str, Any]) -> Dict[str, Any]:
+                            parameters: Dict[str, Any]) -> BuildModelResult:
         """
         Build model structure with available parameters
         
         Returns:
             Model structure and parameter suggestions
         """
-        agent = self.agents.model_builder_agent()
-        agent.tools = [self.tools.model_validation_tool()]
+        agent = self._agents['model_builder']
         
         task = HealthEconTasks.build_model_task(
             agent, model_type, disease_area, parameters, self.ai_mode
         )
-        
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = crew.kickoff()
-        
+
+        result = self._kickoff('model_builder', task)
+        text = result if isinstance(result, str) else str(result)
+
         try:
-            parsed = self._extract_json_from_text(str(result))
-            return {
-                'model_structure': parsed.get('structure', {}),
-                'suggestions': parsed.get('suggestions', []),
-                'auto_filled': parsed.get('auto_filled', []),
-                'status': 'success'
-            }
+            parsed = self._extract_json_from_text(text)
+            return BuildModelResult(
+                model_structure=parsed.get('structure', {}),
+                suggestions=parsed.get('suggestions', []),
+                auto_filled=parsed.get('auto_filled', [])
+            )
         except Exception as e:
-            return {
-                'status': 'error',
-                'error': str(e),
-                'model_structure': {},
-                'suggestions': []
-            }
+            return BuildModelResult(status='error', error=str(e))
     
+    @_cached_kickoff
     def run_validation_task(self, model_structure: Dict[str, Any],
-                           parameters: Dict[str, Any], model_type: str) -> Dict[str, Any]:
+                           parameters: Dict[str, Any], model_type: str) -> ValidationResult:
         """
         Validate model and parameters
         
         Returns:
             Validation results with errors, warnings, suggestions
         """
-        agent = self.agents.parameter_validator_agent()
-        agent.tools = [self.tools.parameter_validation_tool()]
+        # Same structure as a previous validation: the structural findings
+        # are still valid, so only re-check the parameters with the local
+        # deterministic tool and skip the LLM entirely.
+        struct_key = hashlib.blake2b(
+            json.dumps({'m': model_structure, 't': model_type},
+                       sort_keys=True, default=str).encode()
+        ).hexdigest()
+        cached = self._validation_cache.get(struct_key)
+        if cached is not None:
+            return self._revalidate_parameters(cached, model_structure, parameters)
+
+        agent = self._agents['parameter_validator']
         
         task = HealthEconTasks.validation_task(
             agent, model_structure, parameters, model_type
         )
-        
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = crew.kickoff()
-        
+
+        result = self._kickoff('parameter_validator', task)
+        text = result if isinstance(result, str) else str(result)
+
         try:
-            parsed = self._extract_json_from_text(str(result))
-            return {
-                'errors': parsed.get('errors', []),
-                'warnings': parsed.get('warnings', []),
-                'suggestions': parsed.get('suggestions', []),
-                'is_valid': len(parsed.get('errors', [])) == 0,
-                'has_warnings': len(parsed.get('warnings', [])) > 0,
-                'status': 'success'
-            }
+            parsed = self._extract_json_from_text(text)
+            errors = parsed.get('errors', [])
+            warnings = parsed.get('warnings', [])
+            validated = ValidationResult(
+                errors=errors,
+                warnings=warnings,
+                suggestions=parsed.get('suggestions', []),
+                is_valid=len(errors) == 0,
+                has_warnings=len(warnings) > 0
+            )
+            self._validation_cache[struct_key] = validated
+            return validated
         except Exception as e:
-            return {
-                'status': 'error',
-                'error': str(e),
-                'errors': [str(e)],
-                'warnings': [],
-                'suggestions': [],
-                'is_valid': False,
-                'has_warnings': True
-            }
+            return ValidationResult(
+                status='error', error=str(e), errors=[str(e)], has_warnings=True
+            )
+
+    def _revalidate_parameters(self, cached: ValidationResult,
+                               model_structure: Dict[str, Any],
+                               parameters: Dict[str, Any]) -> ValidationResult:
+        """
+        Fast-path validation for an unchanged model structure
+
+        Runs the deterministic parameter checks in-process and merges
+        them with the structural warnings from the cached LLM validation.
+        """
+        checked = self.tools.parameter_validation_tool()._run_native(
+            {'model_structure': model_structure, 'parameters': parameters}
+        )
+
+        errors = checked.get('errors', [])
+        # Keep cached structural warnings, then append any new local ones
+        warnings = list(cached.warnings)
+        warnings.extend(w for w in checked.get('warnings', []) if w not in warnings)
+
+        return ValidationResult(
+            errors=errors,
+            warnings=warnings,
+            suggestions=list(cached.suggestions),
+            is_valid=len(errors) == 0,
+            has_warnings=len(warnings) > 0
+        )
     
+    @_cached_kickoff
     def run_base_case_analysis_task(self, model_type: str, model_structure: Dict[str, Any],
-                                    parameters: Dict[str, Any]) -> Dict[str, Any]:
+                                    parameters: Dict[str, Any]) -> BaseCaseResult:
         """
         Execute base case analysis
         
         Returns:
             Costs, QALYs, ICER, NMB
         """
-        agent = self.agents.analysis_executor_agent()
-        agent.tools = [self.tools.calculation_tool()]
+        agent = self._agents['analysis_executor']
         
         task = HealthEconTasks.base_case_analysis_task(
             agent, model_type, model_structure, parameters
         )
-        
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = crew.kickoff()
-        
+
+        result = self._kickoff('analysis_executor', task)
+        text = result if isinstance(result, str) else str(result)
+
         try:
-            parsed = self._extract_json_from_text(str(result))
-            return {
-                'intervention_cost': parsed.get('intervention_cost', 0),
-                'intervention_qalys': parsed.get('intervention_qalys', 0),
-                'comparator_cost': parsed.get('comparator_cost', 0),
-                'comparator_qalys': parsed.get('comparator_qalys', 0),
-                'incremental_cost': parsed.get('incremental_cost', 0),
-                'incremental_qalys': parsed.get('incremental_qalys', 0),
-                'icer': parsed.get('icer', 0),
-                'nmb': parsed.get('nmb', 0),
-                'status': 'success'
-            }
+            parsed = self._extract_json_from_text(text)
+            return BaseCaseResult(
+                intervention_cost=parsed.get('intervention_cost', 0),
+                intervention_qalys=parsed.get('intervention_qalys', 0),
+                comparator_cost=parsed.get('comparator_cost', 0),
+                comparator_qalys=parsed.get('comparator_qalys', 0),
+                incremental_cost=parsed.get('incremental_cost', 0),
+                incremental_qalys=parsed.get('incremental_qalys', 0),
+                icer=parsed.get('icer', 0),
+                nmb=parsed.get('nmb', 0)
+            )
         except Exception as e:
-            return {
-                'status': 'error',
-                'error': str(e),
-                'intervention_cost': 0,
-                'intervention_qalys': 0,
-                'comparator_cost': 0,
-                'comparator_qalys': 0,
-                'incremental_cost': 0,
-                'incremental_qalys': 0,
-                'icer': 0,
-                'nmb': 0
-            }
+            return BaseCaseResult(status='error', error=str(e))
     
+    @_cached_kickoff
     def run_dsa_task(self, base_case_results: Dict[str, Any],
-                    parameters: Dict[str, Any]) -> Dict[str, Any]:
+                    parameters: Dict[str, Any]) -> DSAResult:
         """
         Execute deterministic sensitivity analysis
         
         Returns:
             Tornado diagram data
         """
-        agent = self.agents.analysis_executor_agent()
-        agent.tools = [self.tools.calculation_tool()]
+        agent = self._agents['analysis_executor']
         
         task = HealthEconTasks.dsa_task(agent, base_case_results, parameters)
-        
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = crew.kickoff()
-        
+
+        result = self._kickoff('analysis_executor', task)
+        text = result if isinstance(result, str) else str(result)
+
         try:
-            parsed = self._extract_json_from_text(str(result))
-            return {
-                'tornado_data': parsed.get('tornado_data', []),
-                'most_sensitive': parsed.get('most_sensitive', []),
-                'status': 'success'
-            }
+            parsed = self._extract_json_from_text(text)
+            return DSAResult(
+                tornado_data=parsed.get('tornado_data', []),
+                most_sensitive=parsed.get('most_sensitive', [])
+            )
         except Exception as e:
-            return {
-                'status': 'error',
-                'error': str(e),
-                'tornado_data': [],
-                'most_sensitive': []
-            }
+            return DSAResult(status='error', error=str(e))
     
+    @_cached_kickoff
     def run_psa_task(self, base_case_results: Dict[str, Any],
-                    parameters: Dict[str, Any], n_simulations: int = 1000) -> Dict[str, Any]:
+                    parameters: Dict[str, Any], n_simulations: int = 1000) -> PSAResult:
         """
         Execute probabilistic sensitivity analysis
         
         Returns:
             PSA results with scatter plot and CEAC data
         """
-        agent = self.agents.analysis_executor_agent()
-        agent.tools = [self.tools.calculation_tool()]
+        agent = self._agents['analysis_executor']
         
         task = HealthEconTasks.psa_task(agent, base_case_results, parameters, n_simulations)
-        
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = crew.kickoff()
-        
+
+        result = self._kickoff('analysis_executor', task)
+        text = result if isinstance(result, str) else str(result)
+
         try:
-            parsed = self._extract_json_from_text(str(result))
-            return {
-                'simulations': parsed.get('simulations', []),
-                'scatter_data': parsed.get('scatter_data', {}),
-                'ceac_data': parsed.get('ceac_data', {}),
-                'mean_icer': parsed.get('mean_icer', 0),
-                'credible_interval': parsed.get('credible_interval', []),
-                'status': 'success'
-            }
+            # Prefer the NDJSON stream: simulations are parsed one line at
+            # a time and reduced to flat cost/QALY arrays, so the full
+            # list-of-dicts payload is never held alongside the raw string.
+            match = _SIMULATIONS_RE.search(text)
+            if match:
+                costs = []
+                qalys = []
+                for sim in _iter_ndjson(match.group(1)):
+                    costs.append(float(sim.get('cost', 0)))
+                    qalys.append(float(sim.get('qalys', 0)))
+                simulations = [
+                    {'cost': c, 'qalys': q} for c, q in zip(costs[:100], qalys[:100])
+                ]
+            else:
+                # Fallback: single JSON blob with an embedded simulations list
+                parsed = self._extract_json_from_text(text)
+                scatter = parsed.get('scatter_data', {})
+                costs = scatter.get('costs') or [
+                    s.get('cost', 0) for s in parsed.get('simulations', [])
+                ]
+                qalys = scatter.get('qalys') or [
+                    s.get('qalys', 0) for s in parsed.get('simulations', [])
+                ]
+                simulations = parsed.get('simulations', [])
+
+            # Summary statistics come from NumPy, not the LLM - agents are
+            # poor calculators and the samples are all we need.
+            stats = _psa_statistics(costs, qalys)
+            return PSAResult(
+                simulations=simulations,
+                scatter_data={'costs': list(costs), 'qalys': list(qalys)},
+                ceac_data=stats['ceac_data'],
+                mean_icer=stats['mean_icer'],
+                credible_interval=stats['credible_interval']
+            )
         except Exception as e:
-            return {
-                'status': 'error',
-                'error': str(e),
-                'simulations': [],
-                'scatter_data': {},
-                'ceac_data': {},
-                'mean_icer': 0,
-                'credible_interval': []
-            }
+            return PSAResult(status='error', error=str(e))
     
+    async def run_sensitivity_analyses(self, base_case_results: Dict[str, Any],
+                                       parameters: Dict[str, Any],
+                                       n_simulations: int = 1000) -> Dict[str, Any]:
+        """
+        Run DSA and PSA concurrently
+
+        Both analyses depend only on base case results and parameters, so
+        their LLM round-trips are independent and can be overlapped. Each
+        task runs in its own worker thread; the kickoff calls are I/O-bound
+        so this roughly halves wall time for the sensitivity stage.
+
+        Returns:
+            Dictionary with 'dsa' and 'psa' result dictionaries
+        """
+        dsa_results, psa_results = await asyncio.gather(
+            asyncio.to_thread(self.run_dsa_task, base_case_results, parameters),
+            asyncio.to_thread(self.run_psa_task, base_case_results, parameters, n_simulations)
+        )
+        return {'dsa': dsa_results, 'psa': psa_results}
+
+    @_cached_kickoff
     def run_report_generation_task(self, project_name: str, model_type: str,
                                    base_case_results: Optional[Dict],
                                    dsa_results: Optional[Dict],
                                    psa_results: Optional[Dict],
-                                   literature_evidence: list) -> Dict[str, Any]:
+                                   literature_evidence: list) -> ReportResult:
         """
         Generate comprehensive analysis report
         
         Returns:
             Formatted report with all sections
         """
-        agent = self.agents.report_generator_agent()
-        agent.tools = [self.tools.report_generator_tool()]
+        agent = self._agents['report_generator']
         
         task = HealthEconTasks.report_generation_task(
             agent, project_name, model_type, base_case_results,
             dsa_results, psa_results, literature_evidence
         )
-        
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
+
+        result = self._kickoff('report_generator', task)
+        text = result if isinstance(result, str) else str(result)
+
+        return ReportResult(report=text)
+
+    async def astream_report_generation_task(self, *args, **kwargs):
+        """
+        Stream the generated report as an async iterator of chunks
+
+        The blocking crew call runs on a worker thread and the report
+        is yielded line by line so sinks (files, SSE) can start writing
+        before the consumer materializes the full string. When CrewAI
+        exposes token callbacks this becomes a true token stream
+        without changing the consumer contract.
+        """
+        result = await asyncio.to_thread(
+            self.run_report_generation_task, *args, **kwargs
         )
-        
-        result = crew.kickoff()
-        
-        return {
-            'report': str(result),
-            'format': 'markdown',
-            'status': 'success'
-        }
+        for chunk in result.report.splitlines(keepends=True):
+            yield chunk
     
     def _extract_json_from_text(self, text: str) -> Dict[str, Any]:
         """
@@ -378,21 +576,15 @@ class HealthEconCrew:
         Returns:
             Parsed dictionary
         """
-        # Try to find JSON in markdown code blocks
-        if '```json' in text:
-            start = text.find('```json') + 7
-            end = text.find('```', start)
-            json_str = text[start:end].strip()
-        elif '```' in text:
-            start = text.find('```') + 3
-            end = text.find('```', start)
-            json_str = text[start:end].strip()
-        else:
-            json_str = text
-        
-        # Try to parse
+        # Find JSON in markdown code blocks with a single regex pass
+        match = _FENCE_RE.search(text)
+        json_str = match.group(1) if match else text
+
+        # Try to parse (orjson is C-accelerated; fall back to stdlib json)
         try:
+            if orjson is not None:
+                return orjson.loads(json_str)
             return json.loads(json_str)
-        except json.JSONDecodeError:
+        except ValueError:
             # If not valid JSON, try to extract key information manually
             return {'raw_output': text}
@@ -0,0 +1,114 @@
+"""
+Typed Result Objects for Crew Tasks
+Slotted dataclasses replacing the per-task dict literals
+
+Slots cut per-instance memory roughly 3x versus dicts and make field
+access a fixed-offset lookup instead of a hash probe, which matters
+when pipelines run in batch mode. Instances are treated as immutable
+once returned; use to_dict() at JSON/state serialization boundaries.
+"""
+from dataclasses import dataclass, field, fields
+from typing import Dict, Any, List, Optional
+
+
+class _ResultBase:
+    """Shared serialization helper for the result dataclasses"""
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a plain dict for JSON/state boundaries"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+@dataclass(slots=True)
+class ParseQueryResult(_ResultBase):
+    """Structured requirements extracted from a user query"""
+    disease_area: str = ''
+    intervention: str = ''
+    comparator: str = ''
+    model_type: str = 'decision_tree'
+    time_horizon: int = 10
+    perspective: str = 'healthcare_system'
+    project_name: str = 'Unnamed Project'
+    summary: str = ''
+    status: str = 'success'
+    error: Optional[str] = None
+    raw_output: Optional[str] = None
+
+
+@dataclass(slots=True)
+class LiteratureResearchResult(_ResultBase):
+    """Parameter evidence synthesized from the literature search"""
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    sources: List[Any] = field(default_factory=list)
+    missing_parameters: List[Any] = field(default_factory=list)
+    quality_assessment: str = 'moderate'
+    status: str = 'success'
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class BuildModelResult(_ResultBase):
+    """Model structure and suggestions from the model builder"""
+    model_structure: Dict[str, Any] = field(default_factory=dict)
+    suggestions: List[Any] = field(default_factory=list)
+    auto_filled: List[Any] = field(default_factory=list)
+    status: str = 'success'
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ValidationResult(_ResultBase):
+    """Validation errors, warnings and suggestions"""
+    errors: List[Any] = field(default_factory=list)
+    warnings: List[Any] = field(default_factory=list)
+    suggestions: List[Any] = field(default_factory=list)
+    is_valid: bool = False
+    has_warnings: bool = False
+    status: str = 'success'
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class BaseCaseResult(_ResultBase):
+    """Deterministic base case costs, QALYs, ICER and NMB"""
+    intervention_cost: float = 0
+    intervention_qalys: float = 0
+    comparator_cost: float = 0
+    comparator_qalys: float = 0
+    incremental_cost: float = 0
+    incremental_qalys: float = 0
+    icer: float = 0
+    nmb: float = 0
+    status: str = 'success'
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class DSAResult(_ResultBase):
+    """One-way sensitivity analysis tornado data"""
+    tornado_data: List[Any] = field(default_factory=list)
+    most_sensitive: List[Any] = field(default_factory=list)
+    status: str = 'success'
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class PSAResult(_ResultBase):
+    """Probabilistic sensitivity analysis samples and summary"""
+    simulations: List[Any] = field(default_factory=list)
+    scatter_data: Dict[str, Any] = field(default_factory=dict)
+    ceac_data: Dict[str, Any] = field(default_factory=dict)
+    mean_icer: float = 0
+    credible_interval: List[float] = field(default_factory=list)
+    status: str = 'success'
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ReportResult(_ResultBase):
+    """Generated analysis report"""
+    report: str = ''
+    format: str = 'markdown'
+    status: str = 'success'
+    error: Optional[str] = None
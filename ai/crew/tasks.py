@@ -1,24 +1,27 @@
 """
 CrewAI Tasks for Health Economics Analysis
 Defines specific tasks that agents perform
+
+Prompt templates are module-level string.Template objects built once at
+import time; the task factories only run a dict substitution over the
+per-call inputs, so the hot path never re-interpolates the triple-quoted
+template bodies.
 """
-from crewai import Task
-from typing import Dict, Any, Optional
+from __future__ import annotations
 
+import string
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
-class HealthEconTasks:
-    """Factory class for creating health economics tasks"""
-    
-    @staticmethod
-    def parse_query_task(agent, user_query: str, ai_mode: str) -> Task:
-        """Task to parse user query and extract requirements"""
-        return Task(
-            description=f"""
+if TYPE_CHECKING:
+    from crewai import Task
+
+
+_PARSE_QUERY_TEMPLATE = string.Template("""
             Analyze the following user query and extract structured information:
-            
-            Query: "{user_query}"
-            AI Mode: {ai_mode}
-            
+
+            Query: "${user_query}"
+            AI Mode: ${ai_mode}
+
             Extract and structure the following information:
             1. Disease area / health condition
             2. Intervention being evaluated
@@ -28,27 +31,47 @@ class HealthEconTasks:
             6. Analysis perspective (healthcare system, societal, etc.)
             7. Time horizon
             8. Any specific requirements or constraints
-            
+
             Provide a clear summary of the analysis objectives.
-            """,
-            agent=agent,
-            expected_output="""A structured JSON with: disease_area, intervention, 
+            """)
+
+_PARSE_QUERY_EXPECTED = """A structured JSON with: disease_area, intervention,
             comparator, model_type, time_horizon, perspective, project_name, summary"""
-        )
-    
-    @staticmethod
-    def literature_research_task(agent, disease_area: str, intervention: str, 
-                                 comparator: str, model_type: str) -> Task:
-        """Task to research literature and find parameter estimates"""
-        return Task(
-            description=f"""
+
+_PARSE_QUERY_BATCH_TEMPLATE = string.Template("""
+            Analyze each of the following user queries and extract structured
+            information for every one of them:
+
+${queries}
+            AI Mode: ${ai_mode}
+
+            For each query, extract and structure the following information:
+            1. Disease area / health condition
+            2. Intervention being evaluated
+            3. Comparator(s)
+            4. Target population
+            5. Recommended model type (decision tree, Markov, PSM)
+            6. Analysis perspective (healthcare system, societal, etc.)
+            7. Time horizon
+            8. Any specific requirements or constraints
+
+            Provide a clear summary of the analysis objectives per query.
+            Return a JSON array with exactly one object per input query,
+            in the same order as the queries above.
+            """)
+
+_PARSE_QUERY_BATCH_EXPECTED = """A JSON array with one object per query, each with:
+            disease_area, intervention, comparator, model_type, time_horizon,
+            perspective, project_name, summary"""
+
+_LITERATURE_RESEARCH_TEMPLATE = string.Template("""
             Conduct a literature search for health economics model parameters:
-            
-            Disease Area: {disease_area}
-            Intervention: {intervention}
-            Comparator: {comparator}
-            Model Type: {model_type}
-            
+
+            Disease Area: ${disease_area}
+            Intervention: ${intervention}
+            Comparator: ${comparator}
+            Model Type: ${model_type}
+
             Find and synthesize evidence for:
             1. Clinical efficacy (relative risks, hazard ratios, response rates)
             2. Utility values (EQ-5D, SF-6D) for health states
@@ -56,223 +79,180 @@ class HealthEconTasks:
             4. Transition probabilities (if Markov model)
             5. Survival parameters (if PSM model)
             6. Patient characteristics (age, baseline risk)
-            
+
             For each parameter:
             - Provide point estimate
             - Provide uncertainty range (95% CI or SD)
             - Cite source (author, year, journal)
             - Assess quality (high/moderate/low)
-            
+
             Flag any missing critical parameters.
-            """,
-            agent=agent,
-            expected_output="""A structured dataset of parameters with point estimates, 
+            """)
+
+_LITERATURE_RESEARCH_EXPECTED = """A structured dataset of parameters with point estimates,
             uncertainty, sources, and quality ratings. List of missing parameters."""
-        )
-    
-    @staticmethod
-    def build_model_task(agent, model_type: str, disease_area: str, 
-                        parameters: Dict[str, Any], ai_mode: str) -> Task:
-        """Task to build model structure"""
-        return Task(
-            description=f"""
-            Build a {model_type} model structure for {disease_area} analysis:
-            
-            Model Type: {model_type}
-            Disease Area: {disease_area}
-            AI Mode: {ai_mode}
-            Available Parameters: {len(parameters)} parameters
-            
+
+_BUILD_MODEL_TEMPLATE = string.Template("""
+            Build a ${model_type} model structure for ${disease_area} analysis:
+
+            Model Type: ${model_type}
+            Disease Area: ${disease_area}
+            AI Mode: ${ai_mode}
+            Available Parameters: ${n_parameters} parameters
+
             For Decision Tree:
             - Define decision nodes, chance nodes, and terminal nodes
             - Specify probabilities and outcomes
             - Structure the tree logically
-            
+
             For Markov Model:
             - Define health states
             - Create transition probability matrix
             - Specify cycle length
             - Define absorbing states
-            
+
             For PSM Model:
             - Define health states (PF, PD, Dead)
             - Specify survival distributions
             - Define treatment duration
-            
+
             Populate the structure with available parameters.
             If AI mode is 'ai-augmented' or 'ai-automated', auto-fill missing parameters.
             If AI mode is 'ai-assisted', flag missing parameters for user input.
-            """,
-            agent=agent,
-            expected_output="""Complete model structure as nested dict/JSON with all 
+            """)
+
+_BUILD_MODEL_EXPECTED = """Complete model structure as nested dict/JSON with all
             states, transitions, parameters populated. List of suggestions for user."""
-        )
-    
-    @staticmethod
-    def validation_task(agent, model_structure: Dict[str, Any], 
-                       parameters: Dict[str, Any], model_type: str) -> Task:
-        """Task to validate model and parameters"""
-        return Task(
-            description=f"""
-            Validate the {model_type} model for errors and issues:
-            
-            Model Structure: {model_structure}
-            Parameters: {parameters}
-            
+
+_VALIDATION_TEMPLATE = string.Template("""
+            Validate the ${model_type} model for errors and issues:
+
+            Model Structure: ${model_structure}
+            Parameters: ${parameters}
+
             Check for:
             1. Mathematical consistency
                - Probabilities sum to 1.0
                - Rates are non-negative
                - Utilities between 0 and 1
-            
+
             2. Clinical plausibility
                - Transition rates reasonable for disease
                - Costs realistic
                - Utilities aligned with health states
-            
+
             3. Completeness
                - All required parameters present
                - No missing data
                - All states connected
-            
+
             4. Best practices
                - Appropriate cycle length
                - Half-cycle correction applied
                - Discount rates standard (3-5%)
-            
+
             Generate:
             - List of errors (must fix)
             - List of warnings (should review)
             - List of suggestions (optional improvements)
             - Overall validation status (pass/fail/review)
-            """,
-            agent=agent,
-            expected_output="""Validation report with errors, warnings, suggestions, 
+            """)
+
+_VALIDATION_EXPECTED = """Validation report with errors, warnings, suggestions,
             and overall status. Flag has_warnings boolean."""
-        )
-    
-    @staticmethod
-    def base_case_analysis_task(agent, model_type: str, model_structure: Dict[str, Any],
-                                parameters: Dict[str, Any]) -> Task:
-        """Task to run base case analysis"""
-        return Task(
-            description=f"""
-            Execute base case analysis for {model_type} model:
-            
-            Model: {model_structure}
-            Parameters: {parameters}
-            
+
+_BASE_CASE_TEMPLATE = string.Template("""
+            Execute base case analysis for ${model_type} model:
+
+            Model: ${model_structure}
+            Parameters: ${parameters}
+
             Calculate:
             1. Total costs (intervention vs comparator)
             2. Total QALYs (intervention vs comparator)
             3. Incremental costs (difference)
             4. Incremental QALYs (difference)
             5. ICER (incremental cost per QALY)
-            6. NMB at WTP threshold ($50,000/QALY)
-            
+            6. NMB at WTP threshold ($$50,000/QALY)
+
             Apply:
             - Discounting (3% for costs and outcomes)
             - Half-cycle correction (if Markov)
             - Proper time horizon
-            
+
             Generate results table with deterministic results.
-            """,
-            agent=agent,
-            expected_output="""Results dict with costs, QALYs, incremental values, 
+            """)
+
+_BASE_CASE_EXPECTED = """Results dict with costs, QALYs, incremental values,
             ICER, NMB for intervention and comparator."""
-        )
-    
-    @staticmethod
-    def dsa_task(agent, base_case_results: Dict[str, Any], 
-                parameters: Dict[str, Any]) -> Task:
-        """Task to run deterministic sensitivity analysis"""
-        return Task(
-            description=f"""
+
+_DSA_TEMPLATE = string.Template("""
             Perform one-way deterministic sensitivity analysis:
-            
-            Base Case Results: {base_case_results}
-            Parameters: {parameters}
-            
+
+            Base Case Results: ${base_case_results}
+            Parameters: ${parameters}
+
             For each uncertain parameter:
             1. Identify reasonable range (±20% or confidence interval)
             2. Calculate ICER at low value
             3. Calculate ICER at high value
             4. Calculate range of ICER variation
-            
+
             Rank parameters by impact on ICER (tornado diagram data).
-            
+
             Test at minimum:
             - Utility values
-            - Cost estimates  
+            - Cost estimates
             - Efficacy parameters
             - Discount rates
-            
+
             Generate tornado diagram data sorted by impact.
-            """,
-            agent=agent,
-            expected_output="""DSA results with parameter ranges, ICER ranges, and 
+            """)
+
+_DSA_EXPECTED = """DSA results with parameter ranges, ICER ranges, and
             tornado diagram data sorted by impact."""
-        )
-    
-    @staticmethod
-    def psa_task(agent, base_case_results: Dict[str, Any], 
-                parameters: Dict[str, Any], n_simulations: int = 1000) -> Task:
-        """Task to run probabilistic sensitivity analysis"""
-        return Task(
-            description=f"""
-            Perform probabilistic sensitivity analysis with {n_simulations} iterations:
-            
-            Base Case: {base_case_results}
-            Parameters: {parameters}
-            
+
+_PSA_TEMPLATE = string.Template("""
+            Perform probabilistic sensitivity analysis with ${n_simulations} iterations:
+
+            Base Case: ${base_case_results}
+            Parameters: ${parameters}
+
             For each parameter:
-            1. Define appropriate distribution (beta for utilities/probabilities, 
+            1. Define appropriate distribution (beta for utilities/probabilities,
                gamma for costs, lognormal for relative risks)
             2. Sample from distributions
             3. Run model iteration
             4. Store costs and QALYs
-            
-            Calculate:
-            1. Mean costs and QALYs
-            2. 95% credible intervals
-            3. Cost-effectiveness plane scatter plot data
-            4. CEAC (cost-effectiveness acceptability curve) data
-               - Test WTP thresholds from $0 to $150,000
-               - Calculate probability cost-effective at each threshold
-            
-            Generate PSA summary statistics and chart data.
-            """,
-            agent=agent,
-            expected_output="""PSA results with simulations array, summary stats, 
-            scatter plot data, and CEAC data."""
-        )
-    
-    @staticmethod
-    def report_generation_task(agent, project_name: str, model_type: str,
-                               base_case_results: Optional[Dict],
-                               dsa_results: Optional[Dict],
-                               psa_results: Optional[Dict],
-                               literature_evidence: list) -> Task:
-        """Task to generate comprehensive report"""
-        return Task(
-            description=f"""
+
+            Output format: emit only the raw simulation samples as NDJSON
+            (one JSON object per line with incremental "cost" and "qalys")
+            between <simulations> and </simulations> markers. Do NOT compute
+            summary statistics, credible intervals, or CEAC data - those
+            are calculated in-process from the samples.
+            """)
+
+_PSA_EXPECTED = """Simulations as NDJSON lines between <simulations>
+            markers, one object per iteration with cost and qalys."""
+
+_REPORT_GENERATION_TEMPLATE = string.Template("""
             Generate a comprehensive health economic analysis report:
-            
-            Project: {project_name}
-            Model Type: {model_type}
-            
+
+            Project: ${project_name}
+            Model Type: ${model_type}
+
             Report Structure (following CHEERS guidelines):
-            
+
             1. EXECUTIVE SUMMARY
                - Research question
                - Model type
                - Key results (ICER, decision)
-            
+
             2. BACKGROUND
                - Disease area
                - Intervention and comparator
                - Analysis rationale
-            
+
             3. METHODS
                - Model structure description
                - Data sources
@@ -280,27 +260,181 @@ class HealthEconTasks:
                - Analysis perspective
                - Time horizon
                - Discounting
-            
+
             4. RESULTS
                - Base case results (table)
                - Cost-effectiveness interpretation
                - DSA results (if available)
                - PSA results (if available)
-            
+
             5. DISCUSSION
                - Key findings
                - Comparison to published studies
                - Limitations
                - Implications
-            
+
             6. CONCLUSION
                - Recommendation
                - Value for money assessment
-            
+
             Use professional language. Include all numerical results.
-            Cite literature sources: {len(literature_evidence)} sources available.
-            """,
-            agent=agent,
-            expected_output="""Complete markdown report following CHEERS structure 
+            Cite literature sources: ${n_sources} sources available.
+            """)
+
+_REPORT_GENERATION_EXPECTED = """Complete markdown report following CHEERS structure
             with all sections, tables, and interpretations."""
+
+
+def _compact_summary(data: Any) -> str:
+    """One-line summary of a dict for prompt embedding
+
+    Interpolating full model structures or parameter sets into the
+    prompt forces the LLM to re-parse JSON-in-prose and inflates the
+    token count; the deterministic value checks run in-process through
+    the tools, so the prompt only needs the shape of the data.
+    """
+    if not isinstance(data, dict):
+        return str(data)
+    keys = list(data)
+    shown = ', '.join(str(k) for k in keys[:10])
+    extra = f' (+{len(keys) - 10} more)' if len(keys) > 10 else ''
+    return f'{len(keys)} entries; keys: {shown}{extra}'
+
+
+class HealthEconTasks:
+    """Factory class for creating health economics tasks"""
+
+    @staticmethod
+    def parse_query_task(agent, user_query: str, ai_mode: str) -> Task:
+        """Task to parse user query and extract requirements"""
+        from crewai import Task
+
+        return Task(
+            description=_PARSE_QUERY_TEMPLATE.substitute(user_query=user_query, ai_mode=ai_mode),
+            agent=agent,
+            expected_output=_PARSE_QUERY_EXPECTED
+        )
+
+    @staticmethod
+    def parse_query_batch_task(agent, queries: list, ai_mode: str) -> Task:
+        """Task to parse several independent user queries in one LLM call"""
+        from crewai import Task
+
+        numbered = ''.join(
+            f'            {i}. "{query}"\n' for i, query in enumerate(queries, 1)
+        )
+        return Task(
+            description=_PARSE_QUERY_BATCH_TEMPLATE.substitute(queries=numbered, ai_mode=ai_mode),
+            agent=agent,
+            expected_output=_PARSE_QUERY_BATCH_EXPECTED
+        )
+
+    @staticmethod
+    def literature_research_task(agent, disease_area: str, intervention: str,
+                                 comparator: str, model_type: str) -> Task:
+        """Task to research literature and find parameter estimates"""
+        from crewai import Task
+
+        return Task(
+            description=_LITERATURE_RESEARCH_TEMPLATE.substitute(
+                disease_area=disease_area, intervention=intervention,
+                comparator=comparator, model_type=model_type
+            ),
+            agent=agent,
+            expected_output=_LITERATURE_RESEARCH_EXPECTED
+        )
+
+    @staticmethod
+    def build_model_task(agent, model_type: str, disease_area: str,
+                        parameters: Dict[str, Any], ai_mode: str) -> Task:
+        """Task to build model structure"""
+        from crewai import Task
+
+        return Task(
+            description=_BUILD_MODEL_TEMPLATE.substitute(
+                model_type=model_type, disease_area=disease_area,
+                ai_mode=ai_mode, n_parameters=len(parameters)
+            ),
+            agent=agent,
+            expected_output=_BUILD_MODEL_EXPECTED
+        )
+
+    @staticmethod
+    def validation_task(agent, model_structure: Dict[str, Any],
+                       parameters: Dict[str, Any], model_type: str) -> Task:
+        """Task to validate model and parameters"""
+        from crewai import Task
+
+        return Task(
+            description=_VALIDATION_TEMPLATE.substitute(
+                model_type=model_type,
+                model_structure=_compact_summary(model_structure),
+                parameters=_compact_summary(parameters)
+            ),
+            agent=agent,
+            expected_output=_VALIDATION_EXPECTED
+        )
+
+    @staticmethod
+    def base_case_analysis_task(agent, model_type: str, model_structure: Dict[str, Any],
+                                parameters: Dict[str, Any]) -> Task:
+        """Task to run base case analysis"""
+        from crewai import Task
+
+        return Task(
+            description=_BASE_CASE_TEMPLATE.substitute(
+                model_type=model_type,
+                model_structure=_compact_summary(model_structure),
+                parameters=_compact_summary(parameters)
+            ),
+            agent=agent,
+            expected_output=_BASE_CASE_EXPECTED
+        )
+
+    @staticmethod
+    def dsa_task(agent, base_case_results: Dict[str, Any],
+                parameters: Dict[str, Any]) -> Task:
+        """Task to run deterministic sensitivity analysis"""
+        from crewai import Task
+
+        return Task(
+            description=_DSA_TEMPLATE.substitute(
+                base_case_results=base_case_results,
+                parameters=_compact_summary(parameters)
+            ),
+            agent=agent,
+            expected_output=_DSA_EXPECTED
+        )
+
+    @staticmethod
+    def psa_task(agent, base_case_results: Dict[str, Any],
+                parameters: Dict[str, Any], n_simulations: int = 1000) -> Task:
+        """Task to run probabilistic sensitivity analysis"""
+        from crewai import Task
+
+        return Task(
+            description=_PSA_TEMPLATE.substitute(
+                n_simulations=n_simulations, base_case_results=base_case_results,
+                parameters=_compact_summary(parameters)
+            ),
+            agent=agent,
+            expected_output=_PSA_EXPECTED
+        )
+
+    @staticmethod
+    def report_generation_task(agent, project_name: str, model_type: str,
+                               base_case_results: Optional[Dict],
+                               dsa_results: Optional[Dict],
+                               psa_results: Optional[Dict],
+                               literature_evidence: list) -> Task:
+        """Task to generate comprehensive report"""
+        from crewai import Task
+
+        return Task(
+            description=_REPORT_GENERATION_TEMPLATE.substitute(
+                project_name=project_name, model_type=model_type,
+                n_sources=len(literature_evidence)
+            ),
+            agent=agent,
+            expected_output=_REPORT_GENERATION_EXPECTED
         )
@@ -2,12 +2,182 @@
 Custom Tools for Health Economics Agents
 Provides specialized capabilities for agents
 """
+import asyncio
+from functools import lru_cache
+
 from crewai_tools import BaseTool
 from typing import Dict, Any, List, Optional
 import numpy as np
-from scipy import stats
+from scipy import sparse, stats
 import json
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback keeps the dependency optional
+    orjson = None
+
+try:
+    import numba
+except ImportError:  # numba is optional; the pure NumPy path still works
+    numba = None
+
+# WTP grid for the cost-effectiveness acceptability curve, built once at
+# import instead of per PSA call
+_WTP_THRESHOLDS = np.linspace(0, 150000, 31)
+
+
+def _json_loads(payload):
+    """Parse JSON with orjson when available (accepts str or bytes)"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _json_dumps(obj) -> str:
+    """Serialize to a JSON string, fast path via orjson
+
+    orjson serializes numpy arrays natively (OPT_SERIALIZE_NUMPY), so
+    float-heavy PSA payloads skip the tolist() object-construction
+    pass; the stdlib fallback converts arrays through a default hook.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(
+        obj, default=lambda o: o.tolist() if hasattr(o, 'tolist') else str(o)
+    )
+# float32 copy used against the float32 PSA samples so the CEAC
+# broadcast never upcasts back to float64
+_WTP_THRESHOLDS_F32 = _WTP_THRESHOLDS.astype(np.float32)
+
+@lru_cache(maxsize=32)
+def _discount_vector(discount_rate: float, time_horizon: int):
+    """Per-cycle discount factors (1+r)^-t for cycles t in [0, T)
+
+    Cached per (rate, horizon) pair: every PSA iteration of a given run
+    reuses the same vector, so the pow work is paid once instead of
+    n_sims * T times. Cycle-level models discount their cost/QALY
+    streams with a single dot product against this vector. The array is
+    marked read-only because it is shared across callers.
+
+    Kept in float64: the vector feeds deterministic base-case outputs,
+    and it is tiny, so the float32 downcast is reserved for the large
+    PSA sample arrays.
+    """
+    vec = (1.0 + discount_rate) ** -np.arange(time_horizon, dtype=np.float64)
+    vec.setflags(write=False)
+    return vec
+
+
+# Shared Generator for unseeded draws: default_rng is faster than the
+# legacy np.random.* globals and is not shared process-wide state
+_rng = np.random.default_rng()
+
+
+def _simulate_psa_numpy(mean_cost: float, cost_sd: float,
+                        mean_qalys: float, qalys_sd: float, n_sims: int,
+                        seed: Optional[int] = None):
+    """Draw PSA cost/QALY samples with vectorized NumPy
+
+    Samples are downcast to float32: the outputs are JSON-stringified to
+    ~6 significant digits and Monte Carlo noise dominates at typical
+    n_sims, so single precision is lossless at the output precision
+    while halving memory traffic for the CEAC broadcast. Passing a seed
+    makes the PSA reproducible.
+    """
+    rng = np.random.default_rng(seed) if seed is not None else _rng
+    costs = rng.normal(mean_cost, cost_sd, n_sims).astype(np.float32, copy=False)
+    qalys = rng.normal(mean_qalys, qalys_sd, n_sims).astype(np.float32, copy=False)
+    return costs, qalys
+
+
+if numba is not None:
+    # The explicit per-simulation loop is the shape the real cycle-level
+    # Markov/PSM simulation will take; numba compiles it to native code
+    # with OpenMP parallelism across simulations. cache=True amortizes
+    # the first-call compile across processes.
+    @numba.njit(cache=True, parallel=True, fastmath=True)
+    def _simulate_psa(mean_cost, cost_sd, mean_qalys, qalys_sd, n_sims):
+        costs = np.empty(n_sims, dtype=np.float32)
+        qalys = np.empty(n_sims, dtype=np.float32)
+        for i in numba.prange(n_sims):
+            costs[i] = np.random.normal(mean_cost, cost_sd)
+            qalys[i] = np.random.normal(mean_qalys, qalys_sd)
+        return costs, qalys
+else:
+    _simulate_psa = _simulate_psa_numpy
+
+
+# Mock literature results keyed by source database. In production each
+# bucket maps to a separate backend (PubMed/Cochrane for efficacy,
+# utility registries, fee schedules) queried by _fetch_source.
+_LITERATURE_SOURCES = {
+    'efficacy': {
+        'parameters': {
+            'intervention_efficacy_rr': {
+                'value': 0.75,
+                'ci': [0.65, 0.85],
+                'source': 'Smith et al. 2023, NEJM',
+                'quality': 'high'
+            }
+        },
+        'sources': ['Smith et al. 2023, NEJM']
+    },
+    'utilities': {
+        'parameters': {
+            'utility_healthy': {
+                'value': 0.85,
+                'ci': [0.80, 0.90],
+                'source': 'Jones et al. 2022, Value in Health',
+                'quality': 'moderate'
+            },
+            'utility_diseased': {
+                'value': 0.65,
+                'ci': [0.58, 0.72],
+                'source': 'Brown et al. 2021, Pharmacoeconomics',
+                'quality': 'moderate'
+            }
+        },
+        'sources': [
+            'Jones et al. 2022, Value in Health',
+            'Brown et al. 2021, Pharmacoeconomics'
+        ]
+    },
+    'costs': {
+        'parameters': {
+            'intervention_cost_annual': {
+                'value': 15000,
+                'ci': [12000, 18000],
+                'source': 'Medicare Fee Schedule 2023',
+                'quality': 'high'
+            },
+            'comparator_cost_annual': {
+                'value': 5000,
+                'ci': [4000, 6000],
+                'source': 'Medicare Fee Schedule 2023',
+                'quality': 'high'
+            }
+        },
+        'sources': []
+    }
+}
+
+
+# Serialized search results keyed by the normalized query tuple; the
+# same query recurs across DSA iterations and re-runs, so all entry
+# points (sync, native, async) share one cache and only the first call
+# per unique query pays the lookup cost. Mirrors _TASK_CACHE in crew.py.
+_SEARCH_CACHE: Dict[tuple, str] = {}
+
+
+def _query_key(query: Dict[str, Any]) -> tuple:
+    """Normalize a query dict to the fields that determine the results"""
+    return (
+        query.get('disease_area', ''),
+        query.get('intervention', ''),
+        query.get('comparator', ''),
+        query.get('parameter_type', ''),
+    )
+
 
 class LiteratureSearchTool(BaseTool):
     """Tool for searching health economics literature"""
@@ -18,65 +188,83 @@ class LiteratureSearchTool(BaseTool):
     Returns relevant studies with parameter estimates."""
     
     def _run(self, query: str) -> str:
+        """Serialize wrapper around _run_native for agent (string) callers"""
+        try:
+            query_dict = _json_loads(query) if isinstance(query, str) else query
+            cached = _SEARCH_CACHE.get(_query_key(query_dict))
+            if cached is not None:
+                # Cache stores the serialized form, so hits skip both the
+                # source lookups and the re-dumps
+                return cached
+            return _json_dumps(self._run_native(query_dict))
+        except Exception as e:
+            return _json_dumps({'error': str(e), 'parameters': {}})
+
+    async def _arun(self, query: str) -> str:
         """
-        Search literature databases
-        
+        Async entry point overlapping the per-source lookups
+
+        The mock backend returns instantly, but the shape matches the
+        production path where every source is a blocking HTTP call
+        (PubMed, Cochrane, CEA Registry, NICE Evidence Search); gather
+        overlaps those round-trips instead of serializing them.
+        """
+        try:
+            query_dict = _json_loads(query) if isinstance(query, str) else query
+            key = _query_key(query_dict)
+            cached = _SEARCH_CACHE.get(key)
+            if cached is not None:
+                return cached
+            parts = await asyncio.gather(
+                *(asyncio.to_thread(self._fetch_source, source, query_dict)
+                  for source in _LITERATURE_SOURCES)
+            )
+            serialized = _json_dumps(self._merge_sources(parts))
+            _SEARCH_CACHE[key] = serialized
+            return serialized
+        except Exception as e:
+            return _json_dumps({'error': str(e), 'parameters': {}})
+
+    def _run_native(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Search literature databases, dict in / dict out
+
+        Sequential fallback used by in-process callers without an event
+        loop; agent callers go through _run or _arun. Hits return a
+        fresh dict parsed from the cached serialization, so callers may
+        mutate the result freely.
+        """
+        key = _query_key(query)
+        cached = _SEARCH_CACHE.get(key)
+        if cached is not None:
+            return _json_loads(cached)
+        merged = self._merge_sources(
+            self._fetch_source(source, query) for source in _LITERATURE_SOURCES
+        )
+        _SEARCH_CACHE[key] = _json_dumps(merged)
+        return merged
+
+    def _fetch_source(self, source: str, query: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Query a single literature source
+
         Note: In production, this would integrate with:
         - PubMed API
         - Cochrane Library
         - Cost-Effectiveness Analysis Registry
         - NICE Evidence Search
         """
-        try:
-            query_dict = json.loads(query) if isinstance(query, str) else query
-            
-            # Mock literature search results
-            # In production, replace with actual API calls
-            mock_results = {
-                'parameters': {
-                    'intervention_efficacy_rr': {
-                        'value': 0.75,
-                        'ci': [0.65, 0.85],
-                        'source': 'Smith et al. 2023, NEJM',
-                        'quality': 'high'
-                    },
-                    'utility_healthy': {
-                        'value': 0.85,
-                        'ci': [0.80, 0.90],
-                        'source': 'Jones et al. 2022, Value in Health',
-                        'quality': 'moderate'
-                    },
-                    'utility_diseased': {
-                        'value': 0.65,
-                        'ci': [0.58, 0.72],
-                        'source': 'Brown et al. 2021, Pharmacoeconomics',
-                        'quality': 'moderate'
-                    },
-                    'intervention_cost_annual': {
-                        'value': 15000,
-                        'ci': [12000, 18000],
-                        'source': 'Medicare Fee Schedule 2023',
-                        'quality': 'high'
-                    },
-                    'comparator_cost_annual': {
-                        'value': 5000,
-                        'ci': [4000, 6000],
-                        'source': 'Medicare Fee Schedule 2023',
-                        'quality': 'high'
-                    }
-                },
-                'sources': [
-                    'Smith et al. 2023, NEJM',
-                    'Jones et al. 2022, Value in Health',
-                    'Brown et al. 2021, Pharmacoeconomics'
-                ],
-                'missing_parameters': []
-            }
-            
-            return json.dumps(mock_results)
-            
-        except Exception as e:
-            return json.dumps({'error': str(e), 'parameters': {}})
+        # Mock lookup; replace with the per-source API client call
+        return _LITERATURE_SOURCES[source]
+
+    @staticmethod
+    def _merge_sources(parts) -> Dict[str, Any]:
+        """Combine per-source result fragments into one evidence set"""
+        merged: Dict[str, Any] = {'parameters': {}, 'sources': [], 'missing_parameters': []}
+        for part in parts:
+            merged['parameters'].update(part['parameters'])
+            merged['sources'].extend(part['sources'])
+        return merged
 
 
 class ParameterValidationTool(BaseTool):
@@ -87,93 +275,102 @@ class ParameterValidationTool(BaseTool):
     and plausibility. Input should be JSON with model_structure and parameters."""
     
     def _run(self, input_data: str) -> str:
-        """
-        Validate parameters
-        """
+        """Serialize wrapper around _run_native for agent (string) callers"""
         try:
-            data = json.loads(input_data) if isinstance(input_data, str) else input_data
-            model_structure = data.get('model_structure', {})
-            parameters = data.get('parameters', {})
-            
-            errors = []
-            warnings = []
-            suggestions = []
-            
-            # Check probabilities
-            for key, value in parameters.items():
-                if 'prob' in key.lower() or 'probability' in key.lower():
-                    val = value if isinstance(value, (int, float)) else value.get('value', 0)
-                    if not 0 <= val <= 1:
-                        errors.append(f"Probability {key} = {val} not in [0, 1]")
-                
-                if 'utility' in key.lower():
-                    val = value if isinstance(value, (int, float)) else value.get('value', 0)
-                    if not 0 <= val <= 1:
-                        errors.append(f"Utility {key} = {val} not in [0, 1]")
-                    if val > 0.95:
-                        warnings.append(f"Utility {key} = {val} seems very high")
-                
-                if 'cost' in key.lower():
-                    val = value if isinstance(value, (int, float)) else value.get('value', 0)
-                    if val < 0:
-                        errors.append(f"Cost {key} = {val} is negative")
-            
-            # Check for missing critical parameters
-            required_params = ['intervention_cost', 'comparator_cost', 'utility']
-            for param in required_params:
-                if not any(param in key.lower() for key in parameters.keys()):
-                    warnings.append(f"Missing {param} parameter")
-            
-            # Suggestions
-            if not errors and not warnings:
-                suggestions.append("Model parameters look good")
-            
-            result = {
-                'errors': errors,
-                'warnings': warnings,
-                'suggestions': suggestions,
-                'is_valid': len(errors) == 0
-            }
-            
-            return json.dumps(result)
-            
+            data = _json_loads(input_data) if isinstance(input_data, str) else input_data
+            return _json_dumps(self._run_native(data))
         except Exception as e:
-            return json.dumps({
+            return _json_dumps({
                 'errors': [str(e)],
                 'warnings': [],
                 'suggestions': [],
                 'is_valid': False
             })
 
+    def _run_native(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate parameters, dict in / dict out
+        """
+        model_structure = data.get('model_structure', {})
+        parameters = data.get('parameters', {})
+
+        errors = []
+        warnings = []
+        suggestions = []
+
+        # Single pass over the parameters: lowercase each key once and
+        # extract the numeric value once instead of redoing both per check
+        lowered_keys = []
+        for key, value in parameters.items():
+            lk = key.lower()
+            lowered_keys.append(lk)
+            val = value if isinstance(value, (int, float)) else value.get('value', 0)
+
+            if 'prob' in lk:  # also matches 'probability'
+                if not 0 <= val <= 1:
+                    errors.append(f"Probability {key} = {val} not in [0, 1]")
+
+            if 'utility' in lk:
+                if not 0 <= val <= 1:
+                    errors.append(f"Utility {key} = {val} not in [0, 1]")
+                if val > 0.95:
+                    warnings.append(f"Utility {key} = {val} seems very high")
+
+            if 'cost' in lk:
+                if val < 0:
+                    errors.append(f"Cost {key} = {val} is negative")
+
+        # Check for missing critical parameters against the already
+        # lowercased keys rather than re-lowering per required param
+        required_params = ['intervention_cost', 'comparator_cost', 'utility']
+        for param in required_params:
+            if not any(param in lk for lk in lowered_keys):
+                warnings.append(f"Missing {param} parameter")
+
+        # Suggestions
+        if not errors and not warnings:
+            suggestions.append("Model parameters look good")
+
+        return {
+            'errors': errors,
+            'warnings': warnings,
+            'suggestions': suggestions,
+            'is_valid': len(errors) == 0
+        }
+
 
 class CalculationTool(BaseTool):
     """Tool for health economics calculations"""
     
     name: str = "Health Economics Calculation Tool"
     description: str = """Perform health economics calculations including ICER, NMB, 
-    discounting, QALY calculations. Input should be JSON with calculation type and parameters."""
+    discounting, QALY calculations. Input should be JSON with calculation type and parameters.
+    PSA results return cost/QALY arrays in scatter_data rather than a per-simulation list."""
     
     def _run(self, input_data: str) -> str:
-        """
-        Perform calculations
-        """
+        """Serialize wrapper around _run_native for agent (string) callers"""
         try:
-            data = json.loads(input_data) if isinstance(input_data, str) else input_data
-            calc_type = data.get('type', 'base_case')
-            
-            if calc_type == 'base_case':
-                return self._calculate_base_case(data)
-            elif calc_type == 'dsa':
-                return self._calculate_dsa(data)
-            elif calc_type == 'psa':
-                return self._calculate_psa(data)
-            else:
-                return json.dumps({'error': 'Unknown calculation type'})
-                
+            data = _json_loads(input_data) if isinstance(input_data, str) else input_data
+            return _json_dumps(self._run_native(data))
         except Exception as e:
-            return json.dumps({'error': str(e)})
+            return _json_dumps({'error': str(e)})
+
+    def _run_native(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Perform calculations, dict in / dict out
+        """
+        calc_type = data.get('type', 'base_case')
+
+        if calc_type == 'base_case':
+            return self._calculate_base_case(data)
+        elif calc_type == 'dsa':
+            return self._calculate_dsa(data)
+        elif calc_type == 'psa':
+            return self._calculate_psa(data)
+        else:
+            return {'error': 'Unknown calculation type'}
     
-    def _calculate_base_case(self, data: Dict) -> str:
+    def _calculate_base_case(self, data: Dict) -> Dict[str, Any]:
         """Calculate base case ICER"""
         params = data.get('parameters', {})
         time_horizon = data.get('time_horizon', 10)
@@ -186,8 +383,10 @@ class CalculationTool(BaseTool):
         intervention_qalys = params.get('utility_intervention', 0.75) * time_horizon
         comparator_qalys = params.get('utility_comparator', 0.65) * time_horizon
         
-        # Apply discounting
-        discount_factor = sum([1 / (1 + discount_rate) ** t for t in range(time_horizon)])
+        # Apply discounting via the cached per-cycle vector; its sum
+        # equals the closed-form geometric series and repeated calls
+        # with the same (rate, horizon) pair hit the lru_cache
+        discount_factor = float(_discount_vector(discount_rate, time_horizon).sum())
         intervention_cost *= discount_factor / time_horizon
         comparator_cost *= discount_factor / time_horizon
         intervention_qalys *= discount_factor / time_horizon
@@ -198,7 +397,7 @@ class CalculationTool(BaseTool):
         icer = incremental_cost / incremental_qalys if incremental_qalys != 0 else float('inf')
         nmb = (incremental_qalys * wtp) - incremental_cost
         
-        result = {
+        return {
             'intervention_cost': round(intervention_cost, 2),
             'intervention_qalys': round(intervention_qalys, 4),
             'comparator_cost': round(comparator_cost, 2),
@@ -208,44 +407,59 @@ class CalculationTool(BaseTool):
             'icer': round(icer, 2),
             'nmb': round(nmb, 2)
         }
-        
-        return json.dumps(result)
     
-    def _calculate_dsa(self, data: Dict) -> str:
+    def _calculate_dsa(self, data: Dict) -> Dict[str, Any]:
         """Calculate DSA tornado data"""
         base_icer = data.get('base_icer', 30000)
         params = data.get('parameters', {})
-        
-        # Mock tornado data
-        tornado_data = []
+
+        # Flatten the parameter dicts once, then do the impact math and
+        # the sort as vector ops instead of per-parameter Python work
+        names = []
+        base_vals = []
+        low_vals = []
+        high_vals = []
         for param, value in params.items():
             if isinstance(value, dict) and 'value' in value:
                 base_val = value['value']
-                low_val = value.get('low', base_val * 0.8)
-                high_val = value.get('high', base_val * 1.2)
-                
-                # Mock impact calculation
-                impact = abs(high_val - low_val) / base_val * base_icer * 0.2
-                
-                tornado_data.append({
-                    'parameter': param,
-                    'base_value': base_val,
-                    'low_value': low_val,
-                    'high_value': high_val,
-                    'icer_low': base_icer - impact,
-                    'icer_high': base_icer + impact,
-                    'impact': impact
-                })
-        
-        # Sort by impact
-        tornado_data.sort(key=lambda x: x['impact'], reverse=True)
-        
-        return json.dumps({
+                names.append(param)
+                base_vals.append(base_val)
+                low_vals.append(value.get('low', base_val * 0.8))
+                high_vals.append(value.get('high', base_val * 1.2))
+
+        if not names:
+            return {'tornado_data': [], 'most_sensitive': []}
+
+        base_arr = np.asarray(base_vals, dtype=np.float64)
+        low_arr = np.asarray(low_vals, dtype=np.float64)
+        high_arr = np.asarray(high_vals, dtype=np.float64)
+
+        # Mock impact calculation
+        impact = np.abs(high_arr - low_arr) / base_arr * base_icer * 0.2
+        icer_low = base_icer - impact
+        icer_high = base_icer + impact
+        order = np.argsort(-impact)
+
+        tornado_data = [
+            {
+                'parameter': names[i],
+                'base_value': base_vals[i],
+                'low_value': low_vals[i],
+                'high_value': high_vals[i],
+                'icer_low': float(icer_low[i]),
+                'icer_high': float(icer_high[i]),
+                'impact': float(impact[i])
+            }
+            for i in order
+        ]
+
+        return {
             'tornado_data': tornado_data,
-            'most_sensitive': [d['parameter'] for d in tornado_data[:5]]
-        })
+            'most_sensitive': [tornado_data[i]['parameter']
+                               for i in range(min(5, len(tornado_data)))]
+        }
     
-    def _calculate_psa(self, data: Dict) -> str:
+    def _calculate_psa(self, data: Dict) -> Dict[str, Any]:
         """Calculate PSA simulations"""
         n_sims = data.get('n_simulations', 1000)
         base_results = data.get('base_case', {})
@@ -254,37 +468,100 @@ class CalculationTool(BaseTool):
         mean_cost = base_results.get('incremental_cost', 10000)
         mean_qalys = base_results.get('incremental_qalys', 0.5)
         
-        costs = np.random.normal(mean_cost, mean_cost * 0.2, n_sims)
-        qalys = np.random.normal(mean_qalys, mean_qalys * 0.15, n_sims)
+        seed = data.get('seed')
+        if seed is not None:
+            # Seeded runs take the Generator path for reproducibility;
+            # the numba kernel draws from its own thread-local streams
+            costs, qalys = _simulate_psa_numpy(
+                mean_cost, mean_cost * 0.2, mean_qalys, mean_qalys * 0.15,
+                n_sims, seed
+            )
+        else:
+            costs, qalys = _simulate_psa(
+                mean_cost, mean_cost * 0.2, mean_qalys, mean_qalys * 0.15, n_sims
+            )
         
-        # CEAC calculation
-        wtp_thresholds = np.linspace(0, 150000, 31)
-        prob_ce = []
-        for wtp in wtp_thresholds:
-            nmb = (qalys * wtp) - costs
-            prob_ce.append((nmb > 0).sum() / n_sims)
+        # CEAC calculation: one broadcast over the (n_sims, n_wtp) grid
+        # instead of a Python loop re-scanning the arrays per threshold.
+        # The float32 samples keep the (n_sims, 31) intermediate small.
+        nmb = qalys[:, None] * _WTP_THRESHOLDS_F32[None, :] - costs[:, None]
+        prob_ce = (nmb > 0).mean(axis=0)
+
+        # Reductions go back to float64 so summary statistics keep full
+        # precision even though the samples are single precision; the
+        # masked divide maps zero-QALY draws to +inf instead of warning
+        icer_samples = np.divide(
+            costs, qalys,
+            out=np.full(n_sims, np.inf, dtype=np.float32),
+            where=qalys != 0
+        ).astype(np.float64)
+        ci_low, ci_high = np.quantile(icer_samples, (0.025, 0.975))
         
-        result = {
-            'simulations': [
-                {'cost': float(c), 'qalys': float(q)} 
-                for c, q in zip(costs[:100], qalys[:100])  # First 100 for size
-            ],
+        # No per-simulation list of dicts: chart consumers read the
+        # arrays in scatter_data, so the old simulations[:100] preview
+        # was pure allocation overhead
+        return {
+            # Arrays are kept as numpy: orjson serializes them natively
+            # and in-process consumers iterate them like lists
             'scatter_data': {
-                'costs': costs.tolist(),
-                'qalys': qalys.tolist()
+                'costs': costs,
+                'qalys': qalys
             },
             'ceac_data': {
-                'wtp_thresholds': wtp_thresholds.tolist(),
+                'wtp_thresholds': _WTP_THRESHOLDS,
                 'prob_ce': prob_ce
             },
             'mean_icer': float(mean_cost / mean_qalys) if mean_qalys != 0 else 0,
-            'credible_interval': [
-                float(np.percentile(costs / qalys, 2.5)),
-                float(np.percentile(costs / qalys, 97.5))
-            ]
+            'credible_interval': [float(ci_low), float(ci_high)]
         }
-        
-        return json.dumps(result)
+
+
+def _transition_csr(structure: Dict[str, Any]):
+    """
+    Build the CSR form of a Markov transition matrix
+
+    Chronic-disease transition matrices are mostly sparse (each state
+    reaches only a few others), so CSR keeps per-cycle state updates at
+    O(nnz) instead of O(S^2). The raw CSR arrays are cached on the
+    structure under '_transition_csr' (JSON-safe lists) so downstream
+    base-case execution can rebuild the matrix without re-walking the
+    dict-of-dicts.
+
+    Returns (csr_matrix, states) where states maps row/column index
+    back to state name.
+    """
+    cached = structure.get('_transition_csr')
+    if cached is not None:
+        n = len(cached['states'])
+        P = sparse.csr_matrix(
+            (cached['data'], cached['indices'], cached['indptr']), shape=(n, n)
+        )
+        return P, cached['states']
+
+    matrix = structure.get('transition_matrix', {})
+    states = list(structure.get('states') or matrix)
+    index = {state: i for i, state in enumerate(states)}
+    for transitions in matrix.values():
+        for target in transitions:
+            if target not in index:
+                index[target] = len(states)
+                states.append(target)
+
+    data: List[float] = []
+    indices: List[int] = []
+    indptr = [0]
+    for state in states:
+        for target, prob in matrix.get(state, {}).items():
+            data.append(prob)
+            indices.append(index[target])
+        indptr.append(len(data))
+
+    n = len(states)
+    P = sparse.csr_matrix((data, indices, indptr), shape=(n, n))
+    structure['_transition_csr'] = {
+        'data': data, 'indices': indices, 'indptr': indptr, 'states': states
+    }
+    return P, states
 
 
 class ModelValidationTool(BaseTool):
@@ -295,38 +572,47 @@ class ModelValidationTool(BaseTool):
     and consistency. Input should be JSON with model_type and structure."""
     
     def _run(self, input_data: str) -> str:
-        """Validate model structure"""
+        """Serialize wrapper around _run_native for agent (string) callers"""
         try:
-            data = json.loads(input_data) if isinstance(input_data, str) else input_data
-            model_type = data.get('model_type', 'decision_tree')
-            structure = data.get('structure', {})
-            
-            errors = []
-            warnings = []
-            
-            if model_type == 'markov':
-                # Check for required Markov components
-                if 'states' not in structure:
-                    errors.append("Missing states definition")
-                if 'transition_matrix' not in structure:
-                    errors.append("Missing transition matrix")
-                    
-                # Check transition matrix sums to 1
-                if 'transition_matrix' in structure:
-                    matrix = structure['transition_matrix']
-                    for state, transitions in matrix.items():
-                        total = sum(transitions.values())
-                        if not 0.99 <= total <= 1.01:
-                            warnings.append(f"Transitions from {state} sum to {total}, not 1.0")
-            
-            return json.dumps({
-                'errors': errors,
-                'warnings': warnings,
-                'is_valid': len(errors) == 0
-            })
-            
+            data = _json_loads(input_data) if isinstance(input_data, str) else input_data
+            return _json_dumps(self._run_native(data))
         except Exception as e:
-            return json.dumps({'errors': [str(e)], 'warnings': [], 'is_valid': False})
+            return _json_dumps({'errors': [str(e)], 'warnings': [], 'is_valid': False})
+
+    def _run_native(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate model structure, dict in / dict out"""
+        model_type = data.get('model_type', 'decision_tree')
+        structure = data.get('structure', {})
+
+        errors = []
+        warnings = []
+
+        if model_type == 'markov':
+            # Check for required Markov components
+            if 'states' not in structure:
+                errors.append("Missing states definition")
+            if 'transition_matrix' not in structure:
+                errors.append("Missing transition matrix")
+
+            # Check transition matrix rows sum to 1: one vectorized
+            # sum over the CSR form instead of nested Python loops; the
+            # CSR arrays stay cached on the structure for the base-case
+            # state_vec @ P cycle updates
+            if 'transition_matrix' in structure:
+                matrix = structure['transition_matrix']
+                P, states = _transition_csr(structure)
+                row_sums = np.asarray(P.sum(axis=1)).ravel()
+                for i, state in enumerate(states):
+                    if state in matrix and not 0.99 <= row_sums[i] <= 1.01:
+                        warnings.append(
+                            f"Transitions from {state} sum to {row_sums[i]}, not 1.0"
+                        )
+
+        return {
+            'errors': errors,
+            'warnings': warnings,
+            'is_valid': len(errors) == 0
+        }
 
 
 class ReportGeneratorTool(BaseTool):
@@ -337,12 +623,21 @@ class ReportGeneratorTool(BaseTool):
     Input should be JSON with all analysis results."""
     
     def _run(self, input_data: str) -> str:
-        """Generate report"""
+        """Deserialize wrapper around _run_native for agent (string) callers"""
         try:
-            data = json.loads(input_data) if isinstance(input_data, str) else input_data
-            
-            # Generate markdown report
-            report = f"""# Health Economic Analysis Report
+            data = _json_loads(input_data) if isinstance(input_data, str) else input_data
+            return self._run_native(data)
+        except Exception as e:
+            return f"Error generating report: {str(e)}"
+
+    def _run_native(self, data: Dict[str, Any]) -> str:
+        """Generate a markdown report from an already-parsed dict
+
+        Sections are collected in a list and joined once at the end;
+        appending to the body string per section (or per PSA row) would
+        be O(n^2) for reports with large embedded tables.
+        """
+        parts = [f"""# Health Economic Analysis Report
 
 ## Executive Summary
 **Project:** {data.get('project_name', 'Unnamed')}
@@ -360,37 +655,84 @@ class ReportGeneratorTool(BaseTool):
 - Incremental QALYs: {data.get('incremental_qalys', 0):.4f}
 - ICER: ${data.get('icer', 0):,.2f} per QALY
 - NMB: ${data.get('nmb', 0):,.2f}
+"""]
+
+        tornado_data = data.get('tornado_data')
+        if tornado_data:
+            rows = "\n".join(
+                f"| {row.get('parameter', '')} "
+                f"| ${row.get('icer_low', 0):,.0f} "
+                f"| ${row.get('icer_high', 0):,.0f} |"
+                for row in tornado_data
+            )
+            parts.append(f"""
+### Deterministic Sensitivity Analysis
+| Parameter | ICER (low) | ICER (high) |
+|---|---|---|
+{rows}
+""")
 
+        ceac_data = data.get('ceac_data')
+        if ceac_data and ceac_data.get('wtp_thresholds'):
+            rows = "\n".join(
+                f"| ${wtp:,.0f} | {prob:.1%} |"
+                for wtp, prob in zip(ceac_data['wtp_thresholds'],
+                                     ceac_data['prob_ce'])
+            )
+            parts.append(f"""
+### Probabilistic Sensitivity Analysis
+Mean ICER: ${data.get('mean_icer', 0):,.0f} per QALY
+
+| WTP Threshold | Probability Cost-Effective |
+|---|---|
+{rows}
+""")
+
+        parts.append(f"""
 ## Conclusion
 The intervention is {'cost-effective' if data.get('nmb', 0) > 0 else 'not cost-effective'} 
 at a willingness-to-pay threshold of ${data.get('wtp', 50000):,.0f} per QALY.
-"""
-            
-            return report
-            
-        except Exception as e:
-            return f"Error generating report: {str(e)}"
+""")
+
+        return "".join(parts)
 
 
 class HealthEconTools:
-    """Factory for health economics tools"""
-    
+    """
+    Factory for health economics tools
+
+    Factories are memoized so every task shares one tool instance per
+    type; assigning them to agents is then pointer assignment rather
+    than repeated object construction, and module-level caches (like
+    the literature search cache) are shared across all agents.
+
+    Tools must stay stateless: no mutable instance attributes beyond
+    name/description. If a tool ever needs per-crew state, pass it in a
+    request-scoped dict through the tool input instead of storing it on
+    the instance, or the singleton sharing here becomes unsafe.
+    """
+
     @staticmethod
+    @lru_cache(maxsize=1)
     def literature_search_tool() -> LiteratureSearchTool:
         return LiteratureSearchTool()
-    
+
     @staticmethod
+    @lru_cache(maxsize=1)
     def parameter_validation_tool() -> ParameterValidationTool:
         return ParameterValidationTool()
-    
+
     @staticmethod
+    @lru_cache(maxsize=1)
     def calculation_tool() -> CalculationTool:
         return CalculationTool()
-    
+
     @staticmethod
+    @lru_cache(maxsize=1)
     def model_validation_tool() -> ModelValidationTool:
         return ModelValidationTool()
-    
+
     @staticmethod
+    @lru_cache(maxsize=1)
     def report_generator_tool() -> ReportGeneratorTool:
         return ReportGeneratorTool()
@@ -2,108 +2,237 @@
 LangGraph Workflow Definition
 Defines the graph structure with nodes and edges for health economics analysis
 """
-from typing import Literal
-from langgraph.graph import StateGraph, END
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+import uuid
+from typing import TYPE_CHECKING, List, Optional, Union
 
-from .state import HealthEconState, WorkflowSteps, create_initial_state
+from .checkpoint import DeltaCheckpointSaver
+from .state import (HealthEconState, WorkflowSteps, create_initial_state,
+                    dumps_state, loads_state)
 from .nodes import HealthEconNodes
 
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
+
+# Checkpoint database for pause/resume across approval cycles
+CHECKPOINT_DB = "healthecon_state.db"
+
+
+class _StateSerializer:
+    """Checkpoint serde backed by dumps_state/loads_state
+
+    Every super-step re-serializes the whole HealthEconState dict, so
+    the checkpointer uses the orjson path (with stdlib fallback) from
+    ai.state instead of the default pure-Python serializer.
+    """
+
+    def dumps(self, obj) -> bytes:
+        return dumps_state(obj)
+
+    def loads(self, raw) -> object:
+        return loads_state(raw)
+
+    def dumps_typed(self, obj) -> tuple:
+        return "json", dumps_state(obj)
+
+    def loads_typed(self, data) -> object:
+        _, raw = data
+        return loads_state(raw)
+
+
+def _parse_query_cache_key(state: HealthEconState) -> str:
+    """Cache key over the only inputs parse_query reads"""
+    raw = f"{state['user_query']}|{state['ai_mode']}"
+    return hashlib.blake2b(raw.encode()).hexdigest()
+
+
+def _evidence_cache_key(state: HealthEconState) -> str:
+    """Cache key over the literature-search inputs"""
+    raw = (f"{state['disease_area']}|{state['intervention']}"
+           f"|{state['comparator']}|{state['model_type']}")
+    return hashlib.blake2b(raw.encode()).hexdigest()
+
+
+def _route_next(state: HealthEconState):
+    """Generic conditional-edge router
+
+    Producing nodes precompute their routing decision into state['_next'],
+    so the scheduler does one key lookup instead of evaluating a
+    per-edge bound method with its own branching.
+    """
+    return state['_next']
+
+
+def _build_model_cache_key(state: HealthEconState) -> str:
+    """Cache key over the model-builder inputs"""
+    params = json.dumps(state['parameter_suggestions'], sort_keys=True, default=str)
+    raw = f"{state['model_type']}|{state['disease_area']}|{params}"
+    return hashlib.blake2b(raw.encode()).hexdigest()
+
 
 class HealthEconGraph:
     """
     LangGraph workflow for health economics modeling
     Integrates CrewAI agents through node functions
+
+    The graph is compiled with a checkpointer and interrupts before the
+    approval node, so approval cycles resume from the interrupt instead
+    of re-running the parse/research/build/validate chain (and its four
+    CrewAI LLM calls) from scratch.
     """
     
     def __init__(self):
         """Initialize the graph with nodes"""
         self.nodes = HealthEconNodes()
+        self.checkpointer = self._build_checkpointer()
         self.graph = self._build_graph()
+        # Config of the most recent run, used when resume callers
+        # don't track thread ids themselves
+        self._active_config: Optional[dict] = None
+        # The topology is immutable after compile, so the mermaid
+        # rendering is computed once on first use
+        self._mermaid_cache: Optional[str] = None
+
+    @staticmethod
+    def _build_checkpointer():
+        """Create the persistent checkpointer, falling back to memory"""
+        try:
+            from langgraph.checkpoint.sqlite import SqliteSaver
+            conn = sqlite3.connect(CHECKPOINT_DB, check_same_thread=False)
+            try:
+                saver = SqliteSaver(conn, serde=_StateSerializer())
+            except TypeError:
+                # Older checkpointer versions without a serde argument
+                saver = SqliteSaver(conn)
+            # Delta-encode checkpoint rows: each super-step persists
+            # only the channels its node wrote, with periodic full
+            # snapshots for bounded reconstruction
+            return DeltaCheckpointSaver(saver)
+        except ImportError:
+            from langgraph.checkpoint.memory import MemorySaver
+            return MemorySaver()
     
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self) -> "StateGraph":
         """
         Build the LangGraph workflow
         Defines nodes and conditional edges
         """
+        # langgraph is imported here rather than at module level so
+        # importing ai.graph stays cheap for consumers that never
+        # compile a workflow
+        from langgraph.graph import StateGraph, END
+        try:
+            # Node-level caching needs langgraph >= 0.6; older versions
+            # just run the nodes uncached
+            from langgraph.types import CachePolicy
+            from langgraph.cache.memory import InMemoryCache
+        except ImportError:
+            CachePolicy = None
+            InMemoryCache = None
+
+        # The parse → research → build → validate chain is purely
+        # linear, so it is fused into one compiled subgraph node: the
+        # parent graph crosses a single super-step boundary (one
+        # checkpoint write, one reducer pass) instead of four. The
+        # three upstream LLM nodes keep their cache policies inside the
+        # subgraph, keyed on their input-relevant state slice only
+        # (accumulating fields like messages/warnings/charts are
+        # deliberately excluded), so repeated queries and resume paths
+        # skip those CrewAI roundtrips entirely.
+        prepare = StateGraph(HealthEconState)
+        if CachePolicy is not None:
+            prepare.add_node(
+                "parse_query", self.nodes.parse_query_node,
+                cache_policy=CachePolicy(key_func=_parse_query_cache_key, ttl=3600)
+            )
+            prepare.add_node(
+                "retrieve_evidence", self.nodes.retrieve_evidence_node,
+                cache_policy=CachePolicy(key_func=_evidence_cache_key, ttl=3600)
+            )
+            prepare.add_node(
+                "build_model", self.nodes.build_model_node,
+                cache_policy=CachePolicy(key_func=_build_model_cache_key, ttl=3600)
+            )
+        else:
+            prepare.add_node("parse_query", self.nodes.parse_query_node)
+            prepare.add_node("retrieve_evidence", self.nodes.retrieve_evidence_node)
+            prepare.add_node("build_model", self.nodes.build_model_node)
+        prepare.add_node("validate_parameters", self.nodes.validate_parameters_node)
+        prepare.set_entry_point("parse_query")
+        prepare.add_edge("parse_query", "retrieve_evidence")
+        prepare.add_edge("retrieve_evidence", "build_model")
+        prepare.add_edge("build_model", "validate_parameters")
+        prepare.add_edge("validate_parameters", END)
+        prepare_kwargs = {}
+        if InMemoryCache is not None:
+            prepare_kwargs['cache'] = InMemoryCache()
+        prepare_graph = prepare.compile(**prepare_kwargs)
+
         # Create graph with HealthEconState
         workflow = StateGraph(HealthEconState)
-        
-        # Add nodes
-        workflow.add_node("parse_query", self.nodes.parse_query_node)
-        workflow.add_node("retrieve_evidence", self.nodes.retrieve_evidence_node)
-        workflow.add_node("build_model", self.nodes.build_model_node)
-        workflow.add_node("validate_parameters", self.nodes.validate_parameters_node)
+
+        workflow.add_node("prepare", prepare_graph)
         workflow.add_node("request_approval", self.nodes.request_approval_node)
         workflow.add_node("run_base_case", self.nodes.run_base_case_node)
         workflow.add_node("run_dsa", self.nodes.run_dsa_node)
         workflow.add_node("run_psa", self.nodes.run_psa_node)
         workflow.add_node("generate_report", self.nodes.generate_report_node)
-        workflow.add_node("end", self.nodes.end_node)
-        
+
         # Set entry point
-        workflow.set_entry_point("parse_query")
-        
-        # Add edges (linear flow)
-        workflow.add_edge("parse_query", "retrieve_evidence")
-        workflow.add_edge("retrieve_evidence", "build_model")
-        workflow.add_edge("build_model", "validate_parameters")
-        
-        # Conditional edge from validation
+        workflow.set_entry_point("prepare")
+
+        # All conditional edges share the generic _next router; the
+        # producing nodes write their decision into state (validation
+        # inside the subgraph precomputes the post-prepare branch)
         workflow.add_conditional_edges(
-            "validate_parameters",
-            self._route_after_validation,
+            "prepare",
+            _route_next,
             {
-                "approval_needed": "request_approval",
-                "proceed": "run_base_case"
+                "request_approval": "request_approval",
+                "run_base_case": "run_base_case"
             }
         )
         
-        # Conditional edge from approval
         workflow.add_conditional_edges(
             "request_approval",
-            self._route_after_approval,
+            _route_next,
             {
-                "approved": "run_base_case",
+                "run_base_case": "run_base_case",
                 "wait": END  # Pause workflow
             }
         )
         
-        # Conditional edge from base case
+        # The base-case router fans out to both sensitivity nodes in
+        # parallel (DSA and PSA only read base_case_results and
+        # parameters, so the same Pregel super-step runs both) and they
+        # join on generate_report
         workflow.add_conditional_edges(
             "run_base_case",
-            self._route_after_base_case,
-            {
-                "run_sensitivity": "run_dsa",
-                "generate_report": "generate_report"
-            }
+            _route_next,
+            ["run_dsa", "run_psa", "generate_report"]
         )
         
-        workflow.add_edge("run_dsa", "run_psa")
-        workflow.add_edge("run_psa", "generate_report")
-        workflow.add_edge("generate_report", "end")
-        workflow.add_edge("end", END)
+        # generate_report terminates the graph directly; a dedicated
+        # end node would cost an extra super-step for bookkeeping that
+        # run() handles around the invoke instead
+        workflow.add_edge(["run_dsa", "run_psa"], "generate_report")
+        workflow.add_edge("generate_report", END)
         
-        return workflow.compile()
-    
-    def _route_after_validation(self, state: HealthEconState) -> Literal["approval_needed", "proceed"]:
-        """Determine if user approval is needed after validation"""
-        if state['requires_user_approval']:
-            return "approval_needed"
-        return "proceed"
-    
-    def _route_after_approval(self, state: HealthEconState) -> Literal["approved", "wait"]:
-        """Route after approval request"""
-        if state['user_approved']:
-            return "approved"
-        return "wait"  # Pause here
-    
-    def _route_after_base_case(self, state: HealthEconState) -> Literal["run_sensitivity", "generate_report"]:
-        """Determine if sensitivity analyses should run"""
-        if state['ai_mode'] == 'ai-automated':
-            return "run_sensitivity"
-        return "generate_report"
+        # Interrupt before the approval node: state is checkpointed per
+        # thread_id and only downstream nodes execute on resume
+        compile_kwargs = {
+            'checkpointer': self.checkpointer,
+            'interrupt_before': ["request_approval"],
+        }
+        if InMemoryCache is not None:
+            compile_kwargs['cache'] = InMemoryCache()
+        return workflow.compile(**compile_kwargs)
     
-    def run(self, user_query: str, ai_mode: str = 'ai-assisted', model_type: str = 'markov') -> HealthEconState:
+    async def run(self, user_query: str, ai_mode: str = 'ai-assisted', model_type: str = 'markov') -> HealthEconState:
         """
         Run the complete workflow
         
@@ -130,8 +259,21 @@ class HealthEconGraph:
         print(f"Model Type: {model_type}")
         print(f"{'='*70}\n")
         
-        # Run the graph
-        final_state = self.graph.invoke(initial_state)
+        # Run the graph under a fresh checkpoint thread; ainvoke lets
+        # the parallel DSA/PSA branches run concurrently
+        t0 = time.perf_counter()
+        config = self._new_config()
+        final_state = await self.graph.ainvoke(initial_state, config=config)
+
+        # Non-assisted modes auto-approve: resume through the interrupt
+        # instead of re-invoking the whole graph
+        if ai_mode != 'ai-assisted' and self.graph.get_state(config).next:
+            self.graph.update_state(config, {'user_approved': True})
+            final_state = await self.graph.ainvoke(None, config=config)
+
+        # Wall-clock bookkeeping lives here rather than in a dedicated
+        # end node, which would cost a whole super-step
+        final_state['meta']['execution_time'] = time.perf_counter() - t0
         
         print(f"\n{'='*70}")
         print(f"✅ Workflow Complete!")
@@ -145,7 +287,7 @@ class HealthEconGraph:
         
         return final_state
     
-    def run_until_approval(self, user_query: str, ai_mode: str = 'ai-assisted', model_type: str = 'markov') -> HealthEconState:
+    async def run_until_approval(self, user_query: str, ai_mode: str = 'ai-assisted', model_type: str = 'markov') -> HealthEconState:
         """
         Run workflow until user approval is needed
         Used for interactive workflows
@@ -159,33 +301,87 @@ class HealthEconGraph:
             model_type=model_type
         )
         
-        # Run until approval needed
-        state = self.graph.invoke(initial_state)
+        # Run until the approval interrupt; the checkpoint persists the
+        # state reached so far under this thread
+        state = await self.graph.ainvoke(initial_state, config=self._new_config())
         
         return state
     
-    def resume_after_approval(self, state: HealthEconState, approved: bool = True) -> HealthEconState:
+    async def resume_after_approval(self, state: HealthEconState, approved: bool = True,
+                                    thread_id: Optional[str] = None) -> HealthEconState:
         """
         Resume workflow after user approval
         
+        Resumes from the checkpointed interrupt, so the upstream nodes
+        (and their LLM calls) do not re-execute.
+
         Args:
             state: State from approval checkpoint
             approved: Whether user approved
+            thread_id: Checkpoint thread to resume; defaults to the
+                most recent run started by this instance
         
         Returns:
             Final state
         """
-        state['user_approved'] = approved
-        
-        if approved:
-            state['current_step'] = WorkflowSteps.RUN_BASE_CASE
-            # Continue from current state
-            final_state = self.graph.invoke(state)
-            return final_state
-        else:
+        config = ({'configurable': {'thread_id': thread_id}} if thread_id
+                  else self._active_config)
+
+        if not approved:
+            state['user_approved'] = False
             state['should_continue'] = False
             state['messages'].append("❌ Analysis cancelled by user")
             return state
+
+        if config is not None and self.graph.get_state(config).next:
+            self.graph.update_state(config, {'user_approved': True})
+            return await self.graph.ainvoke(None, config=config)
+
+        # No checkpoint to resume from (e.g. state was rehydrated in a
+        # new process without its thread id): fall back to re-invoking
+        state['user_approved'] = True
+        state['current_step'] = WorkflowSteps.RUN_BASE_CASE
+        return await self.graph.ainvoke(state, config=self._new_config())
+
+    async def arun_stream(self, user_query: str, ai_mode: str = 'ai-assisted',
+                          model_type: str = 'markov'):
+        """
+        Run the workflow yielding streaming events
+
+        Yields LangGraph stream events (node updates and message
+        chunks) as they happen, so UIs can render progress and report
+        text at first-token latency instead of waiting for the final
+        state.
+        """
+        initial_state = create_initial_state(
+            user_query=user_query,
+            ai_mode=ai_mode,
+            model_type=model_type
+        )
+        config = self._new_config()
+        async for event in self.graph.astream(
+            initial_state, config=config, stream_mode="updates"
+        ):
+            yield event
+
+    # Sync wrappers for CLI / non-async callers
+
+    def run_sync(self, *args, **kwargs) -> HealthEconState:
+        """Blocking wrapper around run() for synchronous callers"""
+        return asyncio.run(self.run(*args, **kwargs))
+
+    def run_until_approval_sync(self, *args, **kwargs) -> HealthEconState:
+        """Blocking wrapper around run_until_approval()"""
+        return asyncio.run(self.run_until_approval(*args, **kwargs))
+
+    def resume_after_approval_sync(self, *args, **kwargs) -> HealthEconState:
+        """Blocking wrapper around resume_after_approval()"""
+        return asyncio.run(self.resume_after_approval(*args, **kwargs))
+
+    def _new_config(self) -> dict:
+        """Allocate a checkpoint thread config for a new run"""
+        self._active_config = {'configurable': {'thread_id': uuid.uuid4().hex}}
+        return self._active_config
     
     def visualize(self, output_path: str = "workflow.png"):
         """
@@ -193,8 +389,10 @@ class HealthEconGraph:
         Requires graphviz
         """
         try:
-            from langgraph.graph.graph import draw_mermaid
-            mermaid_code = draw_mermaid(self.graph)
+            if self._mermaid_cache is None:
+                from langgraph.graph.graph import draw_mermaid
+                self._mermaid_cache = draw_mermaid(self.graph)
+            mermaid_code = self._mermaid_cache
             
             print(f"📊 Workflow Visualization:")
             print(mermaid_code)
@@ -1,267 +1,397 @@
 """
 Node Functions for LangGraph Workflow
 Each node performs a specific task in the health economics modeling pipeline
+
+Nodes are async so parallel branches execute truly concurrently under
+ainvoke; the blocking CrewAI calls are pushed onto worker threads with
+asyncio.to_thread to keep the event loop free.
 """
-from typing import Dict, Any
+import asyncio
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Dict, Any, Optional
 import time
-from datetime import datetime
 
-from .state import HealthEconState, WorkflowSteps
-from .crew.crew import HealthEconCrew
+from .cache import literature_cache
+from .simulate import run_psa_vectorized
+from .state import HealthEconState, WorkflowSteps, dumps_state
+from .crew.results import LiteratureResearchResult, PSAResult, ValidationResult
+
+# Cross-run literature cache entries live for a week
+_LIT_CACHE_TTL = 7 * 86400
+
+# Large analysis payloads are written here and referenced by path from
+# state, keeping checkpoint rows small
+RUNS_DIR = "runs"
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Route workflow logs through a queue so stdout I/O happens on a
+    background thread instead of blocking the event loop
+
+    Returns the started QueueListener; call .stop() on shutdown to
+    flush pending records.
+    """
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, logging.StreamHandler()
+    )
+    listener.start()
+    return listener
+
+
+def _params_fingerprint(parameters: Dict[str, Any],
+                        model_structure: Optional[Dict[str, Any]]) -> str:
+    """Stable content hash of a parameter set and model structure"""
+    payload = json.dumps(
+        {'p': parameters, 'm': model_structure}, sort_keys=True, default=str
+    )
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
+
+def _store_chart_payload(project_id: Any, name: str, data: Any) -> str:
+    """
+    Write a chart payload to runs/<project_id>/<name>.json and return
+    the path
+
+    Checkpoints re-serialize the whole charts list on every super-step,
+    so state keeps only {'type', 'path', 'rows'} refs while the full
+    tornado/scatter/CEAC arrays live on disk.
+    """
+    path = os.path.join(RUNS_DIR, str(project_id or 'default'), f"{name}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(dumps_state(data))
+    return path
+
+
+def _touch_meta(state: HealthEconState) -> Dict[str, Any]:
+    """Copy the meta dict with a fresh updated_at_ns for a partial update
+
+    meta has no reducer, so nodes return a full replacement copy rather
+    than mutating the checkpointed value in place.
+    """
+    return {**state['meta'], 'updated_at_ns': time.time_ns()}
 
 
 class HealthEconNodes:
     """
     Node functions for the LangGraph workflow
-    Each node modifies the state and returns it
+
+    Each node returns only the keys it changed; LangGraph applies the
+    partial dict through the channel reducers, so accumulating fields
+    (messages, warnings, suggestions, charts, final_report_parts) are
+    returned as the new items only, never the full list.
     """
     
     def __init__(self):
         """Initialize nodes with CrewAI crew"""
+        # Imported here rather than at module level so consumers that
+        # only need state helpers don't pay the CrewAI/LLM SDK import
+        from .crew.crew import HealthEconCrew
+
         self.crew = HealthEconCrew()
+        # Validation results keyed by params_fp so approval loops with
+        # unchanged parameters skip the validator LLM call
+        self._validation_cache: Dict[str, Dict[str, Any]] = {}
     
-    def parse_query_node(self, state: HealthEconState) -> HealthEconState:
+    async def parse_query_node(self, state: HealthEconState) -> Dict[str, Any]:
         """
         Parse user query to extract requirements
         Uses QueryParser agent from CrewAI
         """
-        print(f"🔍 [Node: Parse Query] Analyzing: {state['user_query']}")
+        logger.info("🔍 [Node: Parse Query] Analyzing: %s", state['user_query'])
         
-        # Run CrewAI parse_query_task
-        result = self.crew.run_parse_query_task(
-            user_query=state['user_query'],
-            ai_mode=state['ai_mode']
+        # Run CrewAI parse_query_task; the crew injects its own ai_mode
+        # into the task template
+        result = await asyncio.to_thread(
+            self.crew.run_parse_query_task,
+            user_query=state['user_query']
         )
         
-        # Update state
-        state['project_name'] = result.get('project_name', 'Health Economics Analysis')
-        state['disease_area'] = result.get('disease_area', '')
-        state['intervention'] = result.get('intervention', '')
-        state['comparator'] = result.get('comparator', '')
-        state['model_type'] = result.get('model_type', state['model_type'])
-        state['messages'].append(f"✅ Parsed query: {result.get('summary', '')}")
-        state['current_step'] = WorkflowSteps.RETRIEVE_EVIDENCE
-        state['updated_at'] = datetime.now().isoformat()
-        
-        return state
+        # Return only the changed keys; the reducers fold them in
+        return {
+            'project_name': result.project_name,
+            'disease_area': result.disease_area,
+            'intervention': result.intervention,
+            'comparator': result.comparator,
+            'model_type': result.model_type or state['model_type'],
+            'messages': [f"✅ Parsed query: {result.summary}"],
+            'current_step': WorkflowSteps.RETRIEVE_EVIDENCE,
+            'meta': _touch_meta(state),
+        }
     
-    def retrieve_evidence_node(self, state: HealthEconState) -> HealthEconState:
+    async def retrieve_evidence_node(self, state: HealthEconState) -> Dict[str, Any]:
         """
         Retrieve literature evidence and parameter estimates
         Uses LiteratureResearcher agent from CrewAI
         """
-        print(f"📚 [Node: Retrieve Evidence] Searching literature for {state['disease_area']}")
-        
-        # Run CrewAI literature_research_task
-        result = self.crew.run_literature_research_task(
-            disease_area=state['disease_area'],
-            intervention=state['intervention'],
-            comparator=state['comparator'],
-            model_type=state['model_type']
-        )
-        
-        # Update state
-        state['literature_evidence'] = result.get('evidence', [])
-        state['parameter_suggestions'] = result.get('parameters', {})
-        state['messages'].append(f"✅ Retrieved {len(state['literature_evidence'])} evidence sources")
-        state['current_step'] = WorkflowSteps.BUILD_MODEL
-        state['updated_at'] = datetime.now().isoformat()
-        
-        return state
+        logger.info("📚 [Node: Retrieve Evidence] Searching literature for %s", state['disease_area'])
+        
+        # Evidence is deterministic per search tuple, so check the
+        # on-disk cache before paying for the LLM + retrieval roundtrip
+        key = hashlib.sha256(
+            f"{state['disease_area']}|{state['intervention']}"
+            f"|{state['comparator']}|{state['model_type']}".encode()
+        ).hexdigest()
+        cached = literature_cache.get(key)
+        if cached is not None:
+            result = LiteratureResearchResult(**cached)
+        else:
+            # Run CrewAI literature_research_task
+            result = await asyncio.to_thread(
+                self.crew.run_literature_research_task,
+                disease_area=state['disease_area'],
+                intervention=state['intervention'],
+                comparator=state['comparator'],
+                model_type=state['model_type']
+            )
+            try:
+                literature_cache.set(key, result.to_dict(), expire=_LIT_CACHE_TTL)
+            except (TypeError, ValueError):
+                # Non-serializable payloads just skip the cache
+                pass
+        
+        return {
+            'literature_evidence': result.sources,
+            'parameter_suggestions': result.parameters,
+            'messages': [f"✅ Retrieved {len(result.sources)} evidence sources"],
+            'current_step': WorkflowSteps.BUILD_MODEL,
+            'meta': _touch_meta(state),
+        }
     
-    def build_model_node(self, state: HealthEconState) -> HealthEconState:
+    async def build_model_node(self, state: HealthEconState) -> Dict[str, Any]:
         """
         Build model structure based on type
         Uses ModelBuilder agent from CrewAI
         """
-        print(f"🏗️ [Node: Build Model] Creating {state['model_type']} structure")
+        logger.info("🏗️ [Node: Build Model] Creating %s structure", state['model_type'])
         
         # Run CrewAI build_model_task
-        result = self.crew.run_build_model_task(
+        result = await asyncio.to_thread(
+            self.crew.run_build_model_task,
             model_type=state['model_type'],
             disease_area=state['disease_area'],
-            parameter_suggestions=state['parameter_suggestions'],
-            ai_mode=state['ai_mode']
+            parameters=state['parameter_suggestions']
         )
         
-        # Update state
-        state['model_structure'] = result.get('structure', {})
-        state['parameters'] = result.get('populated_parameters', {})
-        state['suggestions'].extend(result.get('suggestions', []))
-        state['messages'].append(f"✅ Built {state['model_type']} model structure")
-        state['current_step'] = WorkflowSteps.VALIDATE_PARAMETERS
-        state['updated_at'] = datetime.now().isoformat()
-        
-        return state
+        return {
+            'model_structure': result.model_structure,
+            'parameters': state['parameter_suggestions'],
+            'params_fp': _params_fingerprint(
+                state['parameter_suggestions'], result.model_structure
+            ),
+            'suggestions': result.suggestions,
+            'messages': [f"✅ Built {state['model_type']} model structure"],
+            'current_step': WorkflowSteps.VALIDATE_PARAMETERS,
+            'meta': _touch_meta(state),
+        }
     
-    def validate_parameters_node(self, state: HealthEconState) -> HealthEconState:
+    async def validate_parameters_node(self, state: HealthEconState) -> Dict[str, Any]:
         """
         Validate model parameters and check for issues
         Uses ParameterValidator agent from CrewAI
         """
-        print(f"✅ [Node: Validate Parameters] Checking {len(state['parameters'])} parameters")
+        logger.info("✅ [Node: Validate Parameters] Checking %d parameters", len(state['parameters']))
         
-        # Run CrewAI validation_task
-        result = self.crew.run_validation_task(
-            model_structure=state['model_structure'],
-            parameters=state['parameters'],
-            model_type=state['model_type']
+        # Identical (parameters, model_structure) sets revalidate from
+        # the fingerprint cache; typical in approval loops where the
+        # user resumes without touching the parameters
+        fp = state['params_fp'] or _params_fingerprint(
+            state['parameters'], state['model_structure']
         )
-        
-        # Update state
-        state['validation_results'] = result
-        state['warnings'].extend(result.get('warnings', []))
-        state['suggestions'].extend(result.get('suggestions', []))
-        
-        # Determine if approval needed based on AI mode
+        cached = self._validation_cache.get(fp)
+        if cached is not None:
+            result = ValidationResult(**cached)
+        else:
+            # Run CrewAI validation_task
+            result = await asyncio.to_thread(
+                self.crew.run_validation_task,
+                model_structure=state['model_structure'],
+                parameters=state['parameters'],
+                model_type=state['model_type']
+            )
+            self._validation_cache[fp] = result.to_dict()
+        
+        update: Dict[str, Any] = {
+            'validation_results': result.to_dict(),
+            'warnings': result.warnings,
+            'suggestions': result.suggestions,
+            'meta': _touch_meta(state),
+        }
+
+        # Determine if approval needed based on AI mode; the routing
+        # decision is precomputed into _next for the generic router
         if state['ai_mode'] == 'ai-assisted':
-            state['requires_user_approval'] = True
-            state['current_step'] = WorkflowSteps.REQUEST_APPROVAL
-            state['messages'].append("⏸️ Waiting for user approval (AI-Assisted mode)")
-        elif state['ai_mode'] == 'ai-augmented' and result.get('has_warnings', False):
-            state['requires_user_approval'] = True
-            state['current_step'] = WorkflowSteps.REQUEST_APPROVAL
-            state['messages'].append("⏸️ Waiting for user approval (warnings found)")
+            update['requires_user_approval'] = True
+            update['current_step'] = WorkflowSteps.REQUEST_APPROVAL
+            update['_next'] = 'request_approval'
+            update['messages'] = ["⏸️ Waiting for user approval (AI-Assisted mode)"]
+        elif state['ai_mode'] == 'ai-augmented' and result.has_warnings:
+            update['requires_user_approval'] = True
+            update['current_step'] = WorkflowSteps.REQUEST_APPROVAL
+            update['_next'] = 'request_approval'
+            update['messages'] = ["⏸️ Waiting for user approval (warnings found)"]
         else:
-            state['user_approved'] = True
-            state['current_step'] = WorkflowSteps.RUN_BASE_CASE
-            state['messages'].append("✅ Parameters validated, proceeding automatically")
-        
-        state['updated_at'] = datetime.now().isoformat()
-        return state
+            update['user_approved'] = True
+            update['current_step'] = WorkflowSteps.RUN_BASE_CASE
+            update['_next'] = 'run_base_case'
+            update['messages'] = ["✅ Parameters validated, proceeding automatically"]
+
+        return update
     
-    def request_approval_node(self, state: HealthEconState) -> HealthEconState:
+    async def request_approval_node(self, state: HealthEconState) -> Dict[str, Any]:
         """
         Request user approval before proceeding
         In real implementation, this would pause and wait for user input
         """
-        print(f"⏸️ [Node: Request Approval] Waiting for user decision")
-        
-        # This is a checkpoint - in real app, workflow pauses here
-        # User reviews validation results and either approves or rejects
-        
-        state['messages'].append("⏸️ User approval required")
-        state['current_step'] = WorkflowSteps.REQUEST_APPROVAL
-        state['updated_at'] = datetime.now().isoformat()
-        
-        # For demo purposes, auto-approve in augmented/automated modes
-        if state['ai_mode'] in ['ai-augmented', 'ai-automated']:
-            state['user_approved'] = True
-            state['current_step'] = WorkflowSteps.RUN_BASE_CASE
-            state['messages'].append("✅ Auto-approved (AI mode)")
-        
-        return state
+        logger.info("⏸️ [Node: Request Approval] Waiting for user decision")
+        
+        # The graph interrupts before this node and persists state via
+        # the checkpointer; the approval decision arrives through
+        # update_state on resume, so no auto-approve logic lives here
+        
+        approved = state['user_approved']
+        return {
+            'messages': ["⏸️ User approval required"],
+            'current_step': (WorkflowSteps.RUN_BASE_CASE if approved
+                             else WorkflowSteps.REQUEST_APPROVAL),
+            '_next': 'run_base_case' if approved else 'wait',
+            'meta': _touch_meta(state),
+        }
     
-    def run_base_case_node(self, state: HealthEconState) -> HealthEconState:
+    async def run_base_case_node(self, state: HealthEconState) -> Dict[str, Any]:
         """
         Run base case analysis
         Uses AnalysisExecutor agent from CrewAI
         """
-        print(f"🔬 [Node: Run Base Case] Executing analysis")
+        logger.info("🔬 [Node: Run Base Case] Executing analysis")
         
         # Run CrewAI base_case_analysis_task
-        result = self.crew.run_base_case_analysis_task(
+        result = await asyncio.to_thread(
+            self.crew.run_base_case_analysis_task,
             model_type=state['model_type'],
             model_structure=state['model_structure'],
             parameters=state['parameters']
         )
         
-        # Update state
-        state['base_case_results'] = result
-        state['icer'] = result.get('icer', None)
-        state['nmb'] = result.get('nmb', None)
-        state['messages'].append(f"✅ Base case complete: ICER = ${state['icer']:,.0f}/QALY" if state['icer'] else "✅ Base case complete")
-        
-        # Determine next step based on AI mode
+        update: Dict[str, Any] = {
+            'base_case_results': result.to_dict(),
+            'icer': result.icer,
+            'nmb': result.nmb,
+            'messages': [f"✅ Base case complete: ICER = ${result.icer:,.0f}/QALY"
+                         if result.icer else "✅ Base case complete"],
+            'meta': _touch_meta(state),
+        }
+
+        # Determine next step based on AI mode; returning both
+        # sensitivity nodes makes LangGraph run them concurrently
         if state['ai_mode'] == 'ai-automated':
-            state['current_step'] = WorkflowSteps.RUN_DSA
+            update['current_step'] = WorkflowSteps.RUN_DSA
+            update['_next'] = ['run_dsa', 'run_psa']
         else:
-            state['current_step'] = WorkflowSteps.GENERATE_REPORT
-        
-        state['updated_at'] = datetime.now().isoformat()
-        return state
+            update['current_step'] = WorkflowSteps.GENERATE_REPORT
+            update['_next'] = 'generate_report'
+
+        return update
     
-    def run_dsa_node(self, state: HealthEconState) -> HealthEconState:
+    async def run_dsa_node(self, state: HealthEconState) -> Dict[str, Any]:
         """
         Run deterministic sensitivity analysis
         Uses AnalysisExecutor agent from CrewAI
         """
-        print(f"📊 [Node: Run DSA] Sensitivity analysis")
+        logger.info("📊 [Node: Run DSA] Sensitivity analysis")
         
         # Run CrewAI dsa_task
-        result = self.crew.run_dsa_task(
+        result = await asyncio.to_thread(
+            self.crew.run_dsa_task,
             base_case_results=state['base_case_results'],
             parameters=state['parameters']
         )
         
-        # Update state
-        state['dsa_results'] = result
-        state['charts'].append({'type': 'tornado', 'data': result.get('tornado_data', [])})
-        state['messages'].append(f"✅ DSA complete: {len(result.get('parameters_tested', []))} parameters tested")
-        state['current_step'] = WorkflowSteps.RUN_PSA
-        state['updated_at'] = datetime.now().isoformat()
-        
-        return state
+        # Partial update only: this node runs in parallel with run_psa,
+        # so it must not write shared scalar keys like current_step
+        tornado_path = _store_chart_payload(
+            state['meta'].get('project_id'), 'tornado', result.tornado_data
+        )
+        return {
+            'dsa_results': result.to_dict(),
+            'charts': [{'type': 'tornado', 'path': tornado_path,
+                        'rows': len(result.tornado_data)}],
+            'messages': [f"✅ DSA complete: {len(result.tornado_data)} parameters tested"],
+        }
     
-    def run_psa_node(self, state: HealthEconState) -> HealthEconState:
+    async def run_psa_node(self, state: HealthEconState) -> Dict[str, Any]:
         """
         Run probabilistic sensitivity analysis
-        Uses AnalysisExecutor agent from CrewAI
+        Runs the vectorized NumPy sampler directly; no LLM in the loop
         """
-        print(f"🎲 [Node: Run PSA] Probabilistic analysis")
-        
-        # Run CrewAI psa_task
-        result = self.crew.run_psa_task(
-            base_case_results=state['base_case_results'],
-            parameters=state['parameters'],
-            n_simulations=1000
+        logger.info("🎲 [Node: Run PSA] Probabilistic analysis")
+        
+        # All draws happen as whole-array NumPy operations, so 1000
+        # simulations are a handful of ufunc calls rather than an
+        # agent-mediated per-draw loop
+        psa = await asyncio.to_thread(
+            run_psa_vectorized,
+            state['parameters'],
+            n=1000,
+            base_case=state['base_case_results']
         )
-        
-        # Update state
-        state['psa_results'] = result
-        state['ceac_data'] = result.get('ceac', [])
-        state['charts'].append({'type': 'ceac', 'data': state['ceac_data']})
-        state['charts'].append({'type': 'scatter', 'data': result.get('scatter_data', [])})
-        state['messages'].append(f"✅ PSA complete: {result.get('n_simulations', 0)} simulations")
-        state['current_step'] = WorkflowSteps.GENERATE_REPORT
-        state['updated_at'] = datetime.now().isoformat()
-        
-        return state
+        result = PSAResult(**psa)
+        
+        # Partial update only: this node runs in parallel with run_dsa,
+        # so it must not write shared scalar keys like current_step
+        project_id = state['meta'].get('project_id')
+        n_sims = len(result.scatter_data.get('costs', []))
+        ceac_path = _store_chart_payload(project_id, 'ceac', result.ceac_data)
+        scatter_path = _store_chart_payload(
+            project_id, 'scatter', result.scatter_data
+        )
+        return {
+            'psa_results': result.to_dict(),
+            'ceac_data': result.ceac_data,
+            'charts': [
+                {'type': 'ceac', 'path': ceac_path,
+                 'rows': len(result.ceac_data.get('wtp_thresholds', []))},
+                {'type': 'scatter', 'path': scatter_path, 'rows': n_sims},
+            ],
+            'messages': [f"✅ PSA complete: {n_sims} simulations"],
+        }
     
-    def generate_report_node(self, state: HealthEconState) -> HealthEconState:
+    async def generate_report_node(self, state: HealthEconState) -> Dict[str, Any]:
         """
         Generate final report with all results
         Uses ReportGenerator agent from CrewAI
         """
-        print(f"📄 [Node: Generate Report] Creating final report")
+        logger.info("📄 [Node: Generate Report] Creating final report")
         
-        # Run CrewAI report_generation_task
-        result = self.crew.run_report_generation_task(
+        # Stream report chunks as they arrive instead of blocking on
+        # the full string; parts accumulate through the state reducer
+        parts = []
+        async for chunk in self.crew.astream_report_generation_task(
             project_name=state['project_name'],
             model_type=state['model_type'],
             base_case_results=state['base_case_results'],
             dsa_results=state['dsa_results'],
             psa_results=state['psa_results'],
             literature_evidence=state['literature_evidence']
-        )
-        
-        # Update state
-        state['final_report'] = result.get('report', '')
-        state['messages'].append("✅ Report generated successfully")
-        state['current_step'] = WorkflowSteps.END
-        state['should_continue'] = False
-        state['updated_at'] = datetime.now().isoformat()
-        
-        return state
-    
-    def end_node(self, state: HealthEconState) -> HealthEconState:
-        """
-        Final node - workflow complete
-        """
-        print(f"🎉 [Node: End] Workflow complete!")
-        
-        state['execution_time'] = time.time()  # In real impl, calculate from start
-        state['messages'].append("🎉 Analysis complete!")
-        state['should_continue'] = False
-        
-        return state
+        ):
+            parts.append(chunk)
+        
+        return {
+            'final_report_parts': parts,
+            'messages': ["✅ Report generated successfully"],
+            'current_step': WorkflowSteps.END,
+            'should_continue': False,
+            'meta': _touch_meta(state),
+        }
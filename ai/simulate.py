@@ -0,0 +1,125 @@
+"""
+Vectorized Monte Carlo Simulation
+Direct NumPy PSA sampler used by the workflow nodes
+
+Sampling and the CEAC are computed as whole-array operations: one draw
+call per parameter and a single broadcast over the WTP grid, instead of
+delegating 1000 per-draw iterations to an agent loop.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Default willingness-to-pay grid for the CEAC
+DEFAULT_WTP_GRID = np.arange(0, 200000, 1000, dtype=np.float64)
+
+_rng = np.random.default_rng()
+
+
+def _parameter_value(spec: Any) -> float:
+    """Extract the point estimate from a parameter entry"""
+    if isinstance(spec, dict):
+        return float(spec.get('value', 0) or 0)
+    if isinstance(spec, (int, float)):
+        return float(spec)
+    return 0.0
+
+
+def _sample_parameter(rng: np.random.Generator, name: str, spec: Any,
+                      n: int) -> Optional[np.ndarray]:
+    """
+    Draw n samples for one parameter, choosing the distribution from
+    its name: beta for utilities/probabilities, gamma for costs,
+    lognormal for relative risks, normal otherwise. Returns None when
+    the point estimate is unusable.
+    """
+    mean = _parameter_value(spec)
+    if mean == 0:
+        return None
+
+    lowered = name.lower()
+    if 'utility' in lowered or 'prob' in lowered:
+        # Beta via method-of-moments with a fixed 10% relative SD
+        mean = min(max(mean, 1e-6), 1 - 1e-6)
+        sd = mean * 0.1
+        common = mean * (1 - mean) / (sd * sd) - 1
+        if common <= 0:
+            return np.full(n, mean)
+        return rng.beta(mean * common, (1 - mean) * common, n)
+    if 'cost' in lowered:
+        # Gamma with 20% relative SD
+        shape = 1 / (0.2 ** 2)
+        return rng.gamma(shape, abs(mean) / shape, n) * np.sign(mean)
+    if '_rr' in lowered or 'ratio' in lowered:
+        # Lognormal centered on the point estimate, 15% sigma
+        return rng.lognormal(np.log(abs(mean)), 0.15, n)
+    return rng.normal(mean, abs(mean) * 0.15, n)
+
+
+def run_psa_vectorized(parameters: Dict[str, Any], n: int = 1000,
+                       wtps: Optional[np.ndarray] = None,
+                       base_case: Optional[Dict[str, Any]] = None,
+                       seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run a vectorized probabilistic sensitivity analysis
+
+    Each parameter is sampled once as an (n,) array from a distribution
+    matching its type, the sampled relative deviations scale the
+    base-case incremental costs and QALYs, and the CEAC comes from one
+    broadcast mean over the WTP grid.
+
+    Returns a dict shaped like the PSA tool output: scatter_data,
+    ceac_data, mean_icer and credible_interval.
+    """
+    rng = np.random.default_rng(seed) if seed is not None else _rng
+    if wtps is None:
+        wtps = DEFAULT_WTP_GRID
+    base_case = base_case or {}
+    mean_cost = base_case.get('incremental_cost', 10000)
+    mean_qalys = base_case.get('incremental_qalys', 0.5)
+
+    # Aggregate per-type relative deviations: cost parameters drive the
+    # incremental-cost spread, utility/probability/efficacy parameters
+    # drive the QALY spread
+    cost_factors = []
+    qaly_factors = []
+    for name, spec in parameters.items():
+        samples = _sample_parameter(rng, name, spec, n)
+        if samples is None:
+            continue
+        relative = samples / samples.mean()
+        if 'cost' in name.lower():
+            cost_factors.append(relative)
+        else:
+            qaly_factors.append(relative)
+
+    if cost_factors:
+        costs = mean_cost * np.mean(cost_factors, axis=0)
+    else:
+        costs = rng.normal(mean_cost, abs(mean_cost) * 0.2, n)
+    if qaly_factors:
+        qalys = mean_qalys * np.mean(qaly_factors, axis=0)
+    else:
+        qalys = rng.normal(mean_qalys, abs(mean_qalys) * 0.15, n)
+
+    # CEAC: one (n, n_wtp) broadcast instead of a per-threshold scan
+    nmb = qalys[:, None] * wtps[None, :] - costs[:, None]
+    prob_ce = (nmb > 0).mean(axis=0)
+
+    icer_samples = np.divide(
+        costs, qalys, out=np.full(n, np.inf), where=qalys != 0
+    )
+    ci_low, ci_high = np.quantile(icer_samples, (0.025, 0.975))
+
+    return {
+        'scatter_data': {
+            'costs': costs.tolist(),
+            'qalys': qalys.tolist(),
+        },
+        'ceac_data': {
+            'wtp_thresholds': wtps.tolist(),
+            'prob_ce': prob_ce.tolist(),
+        },
+        'mean_icer': float(mean_cost / mean_qalys) if mean_qalys != 0 else 0,
+        'credible_interval': [float(ci_low), float(ci_high)],
+    }
@@ -2,9 +2,56 @@
 State Management for Health Economics AI Agents
 Defines the shared state structure for LangGraph workflow
 """
-from typing import TypedDict, List, Dict, Any, Optional, Annotated
+from typing import TypedDict, List, Dict, Any, Optional, Annotated, Union
 from datetime import datetime
+import json
 import operator
+import time
+
+try:
+    # Rust-backed serializer; checkpoint persistence falls back to
+    # stdlib json when it is not installed
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_state(obj: Any) -> bytes:
+    """Serialize a state-shaped object to JSON bytes
+
+    Used for checkpoint rows and chart sidecar files; orjson serializes
+    dict-heavy state several times faster than stdlib json and emits
+    bytes directly.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+    return json.dumps(obj, default=str).encode()
+
+
+def loads_state(raw: Union[bytes, str]) -> Any:
+    """Deserialize JSON bytes produced by dumps_state"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _extend(left: List[Any], right: List[Any]) -> List[Any]:
+    """In-place list reducer for accumulating state channels
+
+    operator.add reallocates the full accumulated list on every node
+    update (O(N^2) traffic across a workflow); extending in place keeps
+    appends amortized O(1). The checkpointer serializes state on
+    persist, so mutating the live channel value does not rewrite
+    historical checkpoints.
+    """
+    if not right:
+        return left
+    left.extend(right)
+    return left
+
 
 class HealthEconState(TypedDict):
     """
@@ -17,7 +64,6 @@ class HealthEconState(TypedDict):
     model_type: str  # 'decision_tree', 'markov', 'psm'
     
     # Project Context
-    project_id: Optional[int]
     project_name: str
     disease_area: str
     intervention: str
@@ -25,13 +71,12 @@ class HealthEconState(TypedDict):
     
     # Model Parameters
     parameters: Dict[str, Any]
-    time_horizon: int
-    discount_rate_cost: float
-    discount_rate_outcome: float
-    wtp_threshold: float
     
     # Intermediate Results
     model_structure: Optional[Dict[str, Any]]
+    # Stable fingerprint of (parameters, model_structure) computed when
+    # the model is built; lets validation short-circuit on identical sets
+    params_fp: str
     literature_evidence: List[Dict[str, Any]]
     parameter_suggestions: Dict[str, Any]
     validation_results: Dict[str, Any]
@@ -43,26 +88,35 @@ class HealthEconState(TypedDict):
     ceac_data: Optional[List[Dict[str, float]]]
     
     # Messages and Feedback
-    messages: Annotated[List[str], operator.add]
-    warnings: Annotated[List[str], operator.add]
-    suggestions: Annotated[List[str], operator.add]
+    messages: Annotated[List[str], _extend]
+    warnings: Annotated[List[str], _extend]
+    suggestions: Annotated[List[str], _extend]
     
     # Workflow Control
     current_step: str
+    # Routing decision written by the producing node and read by the
+    # single generic conditional-edge router (a node name, a fan-out
+    # list of node names, or 'wait')
+    _next: Any
     requires_user_approval: bool
     user_approved: bool
     should_continue: bool
     
     # Output
-    final_report: Optional[str]
-    charts: List[Dict[str, Any]]
+    # Report chunks stream in via the reducer; materialize with
+    # "".join(state['final_report_parts']) at the consumption boundary
+    final_report_parts: Annotated[List[str], _extend]
+    # charts gets appended to by the parallel DSA/PSA branches, so it
+    # needs a reducer like the message lists
+    charts: Annotated[List[Dict[str, Any]], _extend]
     icer: Optional[float]
     nmb: Optional[float]
     
-    # Metadata
-    created_at: str
-    updated_at: str
-    execution_time: float
+    # Rarely-mutated settings and metadata, grouped under one key so
+    # the per-super-step state copy and diff touch a single entry
+    # instead of eight scalars (project_id, time_horizon, discount
+    # rates, wtp_threshold, created_at/updated_at, execution_time)
+    meta: Dict[str, Any]
 
 
 def create_initial_state(
@@ -80,7 +134,6 @@ def create_initial_state(
         model_type=model_type,
         
         # Project Context
-        project_id=None,
         project_name="",
         disease_area="",
         intervention="",
@@ -88,13 +141,10 @@ def create_initial_state(
         
         # Parameters
         parameters={},
-        time_horizon=10,
-        discount_rate_cost=0.03,
-        discount_rate_outcome=0.03,
-        wtp_threshold=50000.0,
         
         # Intermediate
         model_structure=None,
+        params_fp="",
         literature_evidence=[],
         parameter_suggestions={},
         validation_results={},
@@ -112,23 +162,45 @@ def create_initial_state(
         
         # Control
         current_step="start",
+        _next="",
         requires_user_approval=False,
         user_approved=False,
         should_continue=True,
         
         # Output
-        final_report=None,
+        final_report_parts=[],
         charts=[],
         icer=None,
         nmb=None,
         
-        # Metadata
-        created_at=now,
-        updated_at=now,
-        execution_time=0.0
+        # Settings and metadata
+        meta={
+            'project_id': None,
+            'time_horizon': 10,
+            'discount_rate_cost': 0.03,
+            'discount_rate_outcome': 0.03,
+            'wtp_threshold': 50000.0,
+            'created_at': now,
+            # Raw nanosecond timestamp; nodes only bump this integer
+            # and the ISO string is produced lazily via updated_at_iso
+            'updated_at_ns': time.time_ns(),
+            'execution_time': 0.0,
+        }
     )
 
 
+def updated_at_iso(state: HealthEconState) -> str:
+    """Format the last-updated timestamp at the serialization boundary
+
+    Nodes store a single time_ns() integer instead of paying for a
+    datetime construction plus isoformat string on every update; call
+    this only where the human-readable form is actually needed.
+    """
+    return datetime.fromtimestamp(
+        state['meta']['updated_at_ns'] / 1e9
+    ).isoformat()
+
+
 class WorkflowSteps:
     """Constants for workflow step names"""
     START = "start"
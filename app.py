@@ -4,12 +4,20 @@ Module-based architecture with integrated layouts and callbacks
 Red, White, and Black color scheme with collapsible sidebar
 """
 import dash
-from dash import Dash, html, dcc, Input, Output, State
+from dash import Dash, html, dcc, Input, Output, State, ClientsideFunction, ctx
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
+import functools
+import json
 import logging
+import os
+import time
+
+import plotly.utils
+from flask import Response, request, stream_with_context
 
 # Import configuration
-from config.settings import THEME, APP_TITLE, PORT, HOST
+from config.settings import THEME, APP_TITLE, PORT, HOST, DEBUG
 
 # Initialize database
 from database import init_db
@@ -25,19 +33,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Import modules (each has layout + callbacks together)
-from modules.dashboard import layout as dashboard_layout
-from modules.projects import layout as projects_layout, register_callbacks as projects_callbacks
-from modules.decision_tree import layout as decision_tree_layout, register_callbacks as decision_tree_callbacks
-from modules.markov import layout as markov_layout, register_callbacks as markov_callbacks
-from modules.psm import layout as psm_layout, register_callbacks as psm_callbacks
-from modules.input import layout as input_layout, register_callbacks as input_callbacks
-from modules.base_case import layout as base_case_layout, register_callbacks as base_case_callbacks
-from modules.dsa import layout as dsa_layout, register_callbacks as dsa_callbacks
-from modules.psa import layout as psa_layout, register_callbacks as psa_callbacks
-from modules.report import layout as report_layout, register_callbacks as report_callbacks
+import importlib
+import threading
 
 # Initialize Dash app with Bootstrap theme + custom assets
+# Background-callback manager for long-running callbacks (the LLM chat
+# round-trip). Diskcache works per-host without a broker; Celery/Redis
+# would be the swap-in for multi-host deployments. Optional: without
+# diskcache installed the chat callback simply runs blocking.
+try:
+    import diskcache
+    from dash import DiskcacheManager
+
+    _background_manager = DiskcacheManager(
+        diskcache.Cache(os.path.join(".cache", "dash"))
+    )
+except ImportError:
+    _background_manager = None
+
 app = Dash(
     __name__,
     external_stylesheets=[dbc.themes.BOOTSTRAP, dbc.icons.FONT_AWESOME],
@@ -45,184 +58,255 @@ app = Dash(
     suppress_callback_exceptions=True,
     title=APP_TITLE,
     use_pages=False,  # Manual page routing for full control
-    assets_folder='assets'  # Dash automatically loads custom.css and app.js from assets/
+    assets_folder='assets',  # Dash automatically loads custom.css and app.js from assets/
+    background_callback_manager=_background_manager
 )
 
-# Initialize database on startup
-try:
-    init_db()
-    logger.info("Database initialized successfully")
-except Exception as e:
-    logger.error(f"Database initialization failed: {e}")
+# Initialize database on startup, exactly once per process: with
+# Gunicorn preload_app a re-import (reloader, worker restart) must not
+# re-run schema setup
+_DB_INITIALIZED = False
 
-# App layout with collapsible sidebar and AI chat
-app.layout = html.Div([
-    dcc.Location(id='url', refresh=False),
-    dcc.Store(id='ai-mode-store', data='ai-assisted'),  # Store AI mode globally
-    dcc.Store(id='sidebar-state', data={'collapsed': False}),  # Store sidebar state
-    
-    # AI Chat Component (floating button + modal)
-    create_ai_chat_button(),
-    
-    # Header Bar (Red background)
-    html.Div([
+
+def _init_db_once():
+    global _DB_INITIALIZED
+    if _DB_INITIALIZED:
+        return
+    _DB_INITIALIZED = True
+    try:
+        init_db()
+        logger.info("Database initialized successfully")
+    except Exception as e:
+        logger.error(f"Database initialization failed: {e}")
+
+
+_init_db_once()
+
+# Static sidebar NavLink specs as (href, element id, icon, label);
+# module-level tuples so the layout builder iterates shared constants
+# instead of re-literal-ing each link
+_TOP_NAV_ITEMS = (
+    ("/", "nav-dashboard", "fas fa-tachometer-alt", "Dashboard"),
+    ("/projects", "nav-projects", "fas fa-folder-open", "Projects"),
+)
+_MODEL_SETUP_ITEMS = (
+    ("/decision-tree", "nav-decision-tree", "fas fa-code-branch", "Decision Tree"),
+    ("/markov", "nav-markov", "fas fa-circle-notch", "Markov Model"),
+    ("/psm", "nav-psm", "fas fa-chart-area", "Partitioned Survival"),
+)
+_MID_NAV_ITEMS = (
+    ("/input", "nav-input", "fas fa-keyboard", "Input"),
+    ("/base-case", "nav-base-case", "fas fa-calculator", "Base Case Analysis"),
+)
+_SENSITIVITY_ITEMS = (
+    ("/dsa", "nav-dsa", "fas fa-chart-bar", "Deterministic SA"),
+    ("/psa", "nav-psa", "fas fa-dice-d20", "Probabilistic SA"),
+)
+_REPORT_NAV_ITEMS = (
+    ("/report", "nav-report", "fas fa-file-pdf", "Report"),
+)
+
+
+def _nav_link(href, link_id, icon, label, sub=False):
+    """Build one sidebar NavLink from its spec tuple"""
+    return dbc.NavLink([
+        html.I(className=icon),
+        html.Span(label, className='nav-text')
+    ], href=href, id=link_id,
+        className='nav-item nav-sub-item' if sub else 'nav-item')
+
+
+def _nav_section(icon, label, items):
+    """Build a collapsible nav section with its sub-links"""
+    return html.Div([
+        html.Div([
+            html.I(className=f"{icon} me-2"),
+            html.Span(label, className='nav-text')
+        ], className='nav-section-header'),
+        *[_nav_link(*item, sub=True) for item in items],
+    ], className='nav-section')
+
+
+@functools.lru_cache(maxsize=1)
+def build_layout():
+    """
+    Build the static app shell once
+
+    The layout never changes after import, so every worker shares a
+    single component tree instead of reconstructing header, sidebar and
+    content wrappers per access.
+    """
+    return html.Div([
+        dcc.Location(id='url', refresh=False),
+        # local storage so the chosen AI mode survives reloads
+        dcc.Store(id='ai-mode-store', data='ai-assisted', storage_type='local'),
+        dcc.Store(id='sidebar-state', data={'collapsed': False}),  # Store sidebar state
+
+        # AI Chat Component (floating button + modal)
+        create_ai_chat_button(),
+
+        # Header Bar (Red background)
         html.Div([
-            # Hamburger menu button
-            html.Button(
-                html.I(className="fas fa-bars"),
-                id='sidebar-toggle',
-                className='sidebar-toggle-btn',
-                n_clicks=0
-            ),
-            # App title
-            html.Span([
-                html.Strong("Health Economic Modeling Hub", className='app-title')
-            ]),
-            # Right side controls
             html.Div([
+                # Hamburger menu button
                 html.Button(
-                    id='ai-mode-indicator',
-                    className="ai-mode-badge",
-                    children='ASSISTED',
+                    html.I(className="fas fa-bars"),
+                    id='sidebar-toggle',
+                    className='sidebar-toggle-btn',
                     n_clicks=0
-                )
-            ], className='header-right')
-        ], className='header-content')
-    ], className='app-header'),
-    
-    # Main container with sidebar and content
-    html.Div([
-        # Collapsible Sidebar (Red background)
+                ),
+                # App title
+                html.Span([
+                    html.Strong("Health Economic Modeling Hub", className='app-title')
+                ]),
+                # Right side controls
+                html.Div([
+                    html.Button(
+                        id='ai-mode-indicator',
+                        className="ai-mode-badge",
+                        children='ASSISTED',
+                        n_clicks=0
+                    )
+                ], className='header-right')
+            ], className='header-content')
+        ], className='app-header'),
+
+        # Main container with sidebar and content
         html.Div([
+            # Collapsible Sidebar (Red background)
             html.Div([
-                # Dashboard
-                dbc.NavLink([
-                    html.I(className="fas fa-tachometer-alt"),
-                    html.Span("Dashboard", className='nav-text')
-                ], href="/", id="nav-dashboard", className='nav-item'),
-                
-                # Projects
-                dbc.NavLink([
-                    html.I(className="fas fa-folder-open"),
-                    html.Span("Projects", className='nav-text')
-                ], href="/projects", id="nav-projects", className='nav-item'),
-                
-                # Model Setup Section
                 html.Div([
-                    html.Div([
-                        html.I(className="fas fa-cogs me-2"),
-                        html.Span("Model Setup", className='nav-text')
-                    ], className='nav-section-header'),
-                    
-                    # Decision Tree
-                    dbc.NavLink([
-                        html.I(className="fas fa-code-branch"),
-                        html.Span("Decision Tree", className='nav-text')
-                    ], href="/decision-tree", id="nav-decision-tree", className='nav-item nav-sub-item'),
-                    
-                    # Markov Model
-                    dbc.NavLink([
-                        html.I(className="fas fa-circle-notch"),
-                        html.Span("Markov Model", className='nav-text')
-                    ], href="/markov", id="nav-markov", className='nav-item nav-sub-item'),
-                    
-                    # Partitioned Survival Model
-                    dbc.NavLink([
-                        html.I(className="fas fa-chart-area"),
-                        html.Span("Partitioned Survival", className='nav-text')
-                    ], href="/psm", id="nav-psm", className='nav-item nav-sub-item'),
-                ], className='nav-section'),
-                
-                # Input
-                dbc.NavLink([
-                    html.I(className="fas fa-keyboard"),
-                    html.Span("Input", className='nav-text')
-                ], href="/input", id="nav-input", className='nav-item'),
-                
-                # Base Case Analysis
-                dbc.NavLink([
-                    html.I(className="fas fa-calculator"),
-                    html.Span("Base Case Analysis", className='nav-text')
-                ], href="/base-case", id="nav-base-case", className='nav-item'),
-                
-                # Sensitivity Analysis Section
-                html.Div([
-                    html.Div([
-                        html.I(className="fas fa-adjust me-2"),
-                        html.Span("Sensitivity Analysis", className='nav-text')
-                    ], className='nav-section-header'),
-                    
-                    # Deterministic SA
-                    dbc.NavLink([
-                        html.I(className="fas fa-chart-bar"),
-                        html.Span("Deterministic SA", className='nav-text')
-                    ], href="/dsa", id="nav-dsa", className='nav-item nav-sub-item'),
-                    
-                    # Probabilistic SA
-                    dbc.NavLink([
-                        html.I(className="fas fa-dice-d20"),
-                        html.Span("Probabilistic SA", className='nav-text')
-                    ], href="/psa", id="nav-psa", className='nav-item nav-sub-item'),
-                ], className='nav-section'),
-                
-                # Report
-                dbc.NavLink([
-                    html.I(className="fas fa-file-pdf"),
-                    html.Span("Report", className='nav-text')
-                ], href="/report", id="nav-report", className='nav-item'),
-            ], className='sidebar-nav')
-        ], id='sidebar', className='app-sidebar'),
-        
-        # Main content area
-        html.Div([
-            html.Div(id='page-content', className="p-4")
-        ], id='main-content', className='app-content')
-    ], className='app-container')
-], className='app-wrapper')
+                    *[_nav_link(*item) for item in _TOP_NAV_ITEMS],
+                    _nav_section("fas fa-cogs", "Model Setup", _MODEL_SETUP_ITEMS),
+                    *[_nav_link(*item) for item in _MID_NAV_ITEMS],
+                    _nav_section("fas fa-adjust", "Sensitivity Analysis", _SENSITIVITY_ITEMS),
+                    *[_nav_link(*item) for item in _REPORT_NAV_ITEMS],
+                ], className='sidebar-nav')
+            ], id='sidebar', className='app-sidebar'),
 
-# Callback for sidebar collapse/expand
-@app.callback(
+            # Main content area
+            html.Div([
+                html.Div(id='page-content', className="p-4")
+            ], id='main-content', className='app-content')
+        ], className='app-container')
+    ], className='app-wrapper')
+
+
+# App layout with collapsible sidebar and AI chat
+app.layout = build_layout()
+
+# The shell is static, so its JSON form is computed once and the
+# /_dash-layout endpoint serves the cached string instead of
+# re-serializing the component tree on every initial page load
+app._cached_layout_json = json.dumps(
+    app.layout.to_plotly_json(), cls=plotly.utils.PlotlyJSONEncoder
+)
+
+
+def _serve_cached_layout():
+    return Response(app._cached_layout_json, mimetype='application/json')
+
+
+_layout_route = app.config.routes_pathname_prefix + "_dash-layout"
+if _layout_route in app.server.view_functions:
+    app.server.view_functions[_layout_route] = _serve_cached_layout
+
+# Sidebar collapse runs client-side: it is a pure UI class toggle, so
+# handling it in the browser avoids a server round-trip per click
+app.clientside_callback(
+    """function(n_clicks, state) {
+        if (!n_clicks) return ['app-sidebar', 'app-content', state];
+        const collapsed = !(state && state.collapsed);
+        return collapsed
+            ? ['app-sidebar collapsed', 'app-content expanded', {collapsed: true}]
+            : ['app-sidebar', 'app-content', {collapsed: false}];
+    }""",
     Output('sidebar', 'className'),
     Output('main-content', 'className'),
     Output('sidebar-state', 'data'),
     Input('sidebar-toggle', 'n_clicks'),
     State('sidebar-state', 'data')
 )
-def toggle_sidebar(n_clicks, state):
-    """Toggle sidebar collapsed/expanded state"""
-    if n_clicks is None:
-        return 'app-sidebar', 'app-content', state
-    
-    collapsed = not state.get('collapsed', False)
-    
-    if collapsed:
-        return 'app-sidebar collapsed', 'app-content expanded', {'collapsed': True}
-    else:
-        return 'app-sidebar', 'app-content', {'collapsed': False}
 
-# Callback for AI mode indicator update - cycle through modes on click
-@app.callback(
+# AI mode cycling is a pure table lookup, so it runs client-side too
+app.clientside_callback(
+    """function(n_clicks, current_mode) {
+        const labels = {'ai-assisted': 'ASSISTED',
+                        'ai-augmented': 'AUGMENTED',
+                        'ai-automated': 'AUTOMATED'};
+        if (!n_clicks) {
+            // Initial call: reflect the persisted mode in the
+            // indicator without writing the store, or every page load
+            // would reset local storage back to the default
+            return [labels[current_mode] || 'ASSISTED',
+                    window.dash_clientside.no_update];
+        }
+        const next = {'ai-assisted': 'ai-augmented',
+                      'ai-augmented': 'ai-automated',
+                      'ai-automated': 'ai-assisted'}[current_mode] || 'ai-assisted';
+        return [labels[next], next];
+    }""",
     [Output('ai-mode-indicator', 'children'),
      Output('ai-mode-store', 'data')],
     Input('ai-mode-indicator', 'n_clicks'),
     State('ai-mode-store', 'data')
 )
-def cycle_ai_mode(n_clicks, current_mode):
-    """Cycle through AI modes on button click"""
-    if n_clicks is None or n_clicks == 0:
-        return 'ASSISTED', 'ai-assisted'
-    
-    modes = ['ai-assisted', 'ai-augmented', 'ai-automated']
-    labels = {'ai-assisted': 'ASSISTED', 'ai-augmented': 'AUGMENTED', 'ai-automated': 'AUTOMATED'}
-    
-    # Get current index and cycle to next
-    try:
-        current_idx = modes.index(current_mode)
-        next_idx = (current_idx + 1) % len(modes)
-        next_mode = modes[next_idx]
-        return labels[next_mode], next_mode
-    except:
-        return 'ASSISTED', 'ai-assisted'
+
+# O(1) dispatch table for page routing, filled by _load_modules; route
+# path -> module name under modules/
+_ROUTE_MODULES = {
+    '/': 'dashboard',
+    '/projects': 'projects',
+    '/decision-tree': 'decision_tree',
+    '/markov': 'markov',
+    '/psm': 'psm',
+    '/input': 'input',
+    '/base-case': 'base_case',
+    '/dsa': 'dsa',
+    '/psa': 'psa',
+    '/report': 'report',
+}
+ROUTES = {}
+
+_modules_loaded = False
+_modules_lock = threading.Lock()
+
+
+def _load_modules():
+    """
+    Import the page modules and register their callbacks once
+
+    The page modules pull in pandas/plotly/scipy transitively, so the
+    import happens on the first HTTP request instead of at module
+    import time - startup and Gunicorn worker forks stay cheap. Loading
+    is hooked before_request (not per-route) because the client learns
+    the callback graph from /_dash-dependencies, which is fetched
+    before any page callback fires.
+    """
+    global _modules_loaded
+    with _modules_lock:
+        if _modules_loaded:
+            return
+        for path, name in _ROUTE_MODULES.items():
+            module = importlib.import_module(f'modules.{name}')
+            ROUTES[path] = module.layout
+            register = getattr(module, 'register_callbacks', None)
+            if register is not None:
+                register(app)
+        _modules_loaded = True
+
+
+@app.server.before_request
+def _ensure_modules_loaded():
+    if not _modules_loaded:
+        _load_modules()
+
+# The 404 page is static too; build it once
+_NOT_FOUND = html.Div([
+    html.H1("404: Page Not Found", className="text-center mt-5"),
+    dbc.Button("Go Home", href="/", color="danger", className="mt-3")
+], className="text-center")
+
 
 # Callback for page routing
 @app.callback(
@@ -231,141 +315,329 @@ def cycle_ai_mode(n_clicks, current_mode):
 )
 def display_page(pathname):
     """Route to different page layouts based on URL"""
-    if pathname == '/':
-        return dashboard_layout
-    elif pathname == '/projects':
-        return projects_layout
-    elif pathname == '/decision-tree':
-        return decision_tree_layout
-    elif pathname == '/markov':
-        return markov_layout
-    elif pathname == '/psm':
-        return psm_layout
-    elif pathname == '/input':
-        return input_layout
-    elif pathname == '/base-case':
-        return base_case_layout
-    elif pathname == '/dsa':
-        return dsa_layout
-    elif pathname == '/psa':
-        return psa_layout
-    elif pathname == '/report':
-        return report_layout
-    else:
-        return html.Div([
-            html.H1("404: Page Not Found", className="text-center mt-5"),
-            dbc.Button("Go Home", href="/", color="danger", className="mt-3")
-        ], className="text-center")
-
-# Register all callbacks from modules
-projects_callbacks(app)
-decision_tree_callbacks(app)
-markov_callbacks(app)
-psm_callbacks(app)
-input_callbacks(app)
-base_case_callbacks(app)
-dsa_callbacks(app)
-psa_callbacks(app)
-report_callbacks(app)
+    return ROUTES.get(pathname, _NOT_FOUND)
+
+# Module callbacks are registered by _load_modules on first request
 
 # ============= AI CHAT CALLBACKS =============
 
+import hashlib
+
 from services.ai_service import AIService
-from components.ai.AIChat import format_chat_message
+from ai.cache import CACHE_DIR, DiskCache
 from datetime import datetime
 
-# Initialize AI service with auto-fallback
-ai_service = AIService()
+# Identical (message, history) pairs re-hit the LLM API otherwise;
+# responses are memoized for an hour in the shared on-disk cache so
+# repeated prompts cost a lookup instead of a paid round-trip. SQLite
+# keeps the cache shared across Gunicorn workers without a Redis
+# dependency.
+_chat_cache = DiskCache(os.path.join(CACHE_DIR, "chat.db"))
+_CHAT_CACHE_TTL = 3600
 
-@app.callback(
+
+def _chat_cache_key(message, history):
+    payload = json.dumps({'m': message, 'h': history}, sort_keys=True)
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
+
+# Concurrent duplicates of the same prompt (double-clicks, multiple
+# tabs, network retries, the stream endpoint racing the callback) share
+# one upstream LLM call. The coordination point is a short-lived lease
+# row in the shared SQLite cache rather than an in-process map: with
+# the Diskcache background manager each callback runs in its own job
+# process, and gunicorn runs several workers, so only cross-process
+# state can dedup. The first arrival claims the lease and calls the
+# provider; the rest poll the cache for its response.
+_CHAT_LEASE_TTL = 120  # upper bound on one LLM round-trip, seconds
+_CHAT_LEASE_POLL = 0.2
+
+# AIService reports failures as text instead of raising; those strings
+# must never be memoized or a transient provider error would be
+# replayed to every user for the next hour
+_ERROR_RESPONSE_PREFIXES = (
+    'Error:',
+    'Sorry, I encountered an error',
+    'AI service is not configured',
+)
+
+
+def _cacheable_response(response):
+    return bool(response) and not response.lstrip().startswith(
+        _ERROR_RESPONSE_PREFIXES
+    )
+
+
+def _claim_chat_lease(cache_key):
+    return _chat_cache.add(cache_key + ':lease', 1, expire=_CHAT_LEASE_TTL)
+
+
+def _release_chat_lease(cache_key):
+    _chat_cache.delete(cache_key + ':lease')
+
+
+def _await_chat_response(cache_key):
+    """Poll the shared cache while another process holds the lease.
+
+    Returns None if the holder released (or its lease expired) without
+    caching a response - e.g. the provider returned an error."""
+    deadline = time.monotonic() + _CHAT_LEASE_TTL
+    while time.monotonic() < deadline:
+        response = _chat_cache.get(cache_key)
+        if response is not None:
+            return response
+        if (cache_key + ':lease') not in _chat_cache:
+            return _chat_cache.get(cache_key)
+        time.sleep(_CHAT_LEASE_POLL)
+    return None
+
+
+def _fetch_chat_response(ai_service, cache_key, message, api_history):
+    """Call the LLM once per distinct prompt across processes,
+    deduplicating concurrent identical requests and filling the on-disk
+    response cache"""
+    if _claim_chat_lease(cache_key):
+        try:
+            response = ai_service.chat(
+                message, conversation_history=api_history
+            )
+            if _cacheable_response(response):
+                _chat_cache.set(cache_key, response, expire=_CHAT_CACHE_TTL)
+            return response
+        finally:
+            _release_chat_lease(cache_key)
+
+    response = _await_chat_response(cache_key)
+    if response is not None:
+        return response
+
+    # The lease holder failed or timed out without caching; fall back
+    # to a direct call rather than surfacing an empty reply
+    response = ai_service.chat(message, conversation_history=api_history)
+    if _cacheable_response(response):
+        _chat_cache.set(cache_key, response, expire=_CHAT_CACHE_TTL)
+    return response
+
+
+# Server-sent events endpoint for progressive display: tokens reach the
+# browser as the LLM emits them, so perceived latency is time-to-first-
+# token rather than total generation time. The stream shares the
+# cross-process lease and response cache with handle_chat - which runs
+# in a separate job process under the background manager - so a send
+# that triggers both the stream and the callback still makes one API
+# call whichever process wins the lease.
+@app.server.route('/ai/stream', methods=['POST'])
+def ai_stream():
+    payload = request.get_json(silent=True) or {}
+    message = (payload.get('message') or '').strip()
+    if not message:
+        return Response('missing message', status=400)
+    ai_service = get_ai_service()
+    if not ai_service.is_available():
+        return Response('AI service not configured', status=503)
+    api_history = _api_history(payload.get('history') or [])
+    cache_key = _chat_cache_key(message, api_history)
+
+    def _events():
+        cached = _chat_cache.get(cache_key)
+        if cached is not None:
+            yield f"data: {json.dumps(cached)}\n\n"
+            yield "data: [DONE]\n\n"
+            return
+        if not _claim_chat_lease(cache_key):
+            # Another process already owns this prompt (typically the
+            # background callback for this same send); relay its result
+            response = _await_chat_response(cache_key)
+            if response is not None:
+                yield f"data: {json.dumps(response)}\n\n"
+            yield "data: [DONE]\n\n"
+            return
+        try:
+            parts = []
+            for token in ai_service.stream_chat(
+                message, conversation_history=api_history
+            ):
+                parts.append(token)
+                yield f"data: {json.dumps(token)}\n\n"
+            response = ''.join(parts)
+            # stream_chat never raises - failures arrive as error text,
+            # which must not be memoized and replayed for an hour
+            if _cacheable_response(response):
+                _chat_cache.set(cache_key, response, expire=_CHAT_CACHE_TTL)
+        finally:
+            _release_chat_lease(cache_key)
+        yield "data: [DONE]\n\n"
+
+    return Response(stream_with_context(_events()),
+                    mimetype='text/event-stream')
+
+# AI service singleton via lru_cache rather than a module global; the
+# constructor parses env config and builds provider clients, so it must
+# stay off the per-message hot path
+@functools.lru_cache(maxsize=4)
+def get_ai_service(provider=None):
+    return AIService(provider=provider)
+
+
+# The clear branch always returns the same payload; built once
+_CLEARED_RETURN = ([], '', 'Chat history cleared')
+
+# Static guidance shown when no provider key is configured; the text
+# never changes, only the timestamp on the record carrying it
+_NO_API_KEY_MSG = (
+    "⚠️ AI service is not configured. Please add your API key to environment variables:\n\n"
+    "- For OpenAI: Set `OPENAI_API_KEY`\n"
+    "- For Anthropic: Set `ANTHROPIC_API_KEY`"
+)
+
+
+def _api_history(history):
+    """Strip chat records down to the {role, content} shape the LLM
+    APIs accept, dropping locally-rendered error notices"""
+    return [{'role': m['role'], 'content': m['content']}
+            for m in history
+            if m.get('role') in ('user', 'assistant') and not m.get('error')]
+
+
+def _hhmm() -> str:
+    """Current HH:MM chat timestamp; f-string skips strftime's parser"""
+    now = datetime.now()
+    return f"{now.hour:02d}:{now.minute:02d}"
+
+# Modal open/close is a pure boolean flip; run it in the browser like
+# the other UI toggles
+app.clientside_callback(
+    """function(open_clicks, close_clicks, is_open) {
+        if (open_clicks || close_clicks) return !is_open;
+        return !!is_open;
+    }""",
     Output('ai-chat-modal', 'is_open'),
     [Input('ai-chat-button', 'n_clicks'),
      Input('ai-chat-close', 'n_clicks')],
     [State('ai-chat-modal', 'is_open')]
 )
-def toggle_ai_modal(open_clicks, close_clicks, is_open):
-    """Toggle AI chat modal"""
-    if open_clicks or close_clicks:
-        return not is_open
-    return is_open
+
+# Messages render client-side from the raw history records, so this
+# callback ships only data deltas instead of component trees scaling
+# with transcript length
+app.clientside_callback(
+    ClientsideFunction(namespace='ai_chat', function_name='render_messages'),
+    Output('ai-chat-messages', 'children'),
+    Input('ai-conversation-history', 'data')
+)
+
+
+# Run the chat callback in the background when a manager is available:
+# the LLM round-trip takes seconds and would otherwise pin a request
+# thread per active chat; the send button is disabled while running
+_chat_callback_kwargs = {'prevent_initial_call': True}
+if _background_manager is not None:
+    _chat_callback_kwargs.update(
+        background=True,
+        running=[(Output('ai-chat-send', 'disabled'), True, False)],
+    )
+
 
 @app.callback(
-    [Output('ai-chat-messages', 'children'),
+    [Output('ai-conversation-history', 'data'),
      Output('ai-chat-input', 'value'),
-     Output('ai-conversation-history', 'data'),
      Output('ai-chat-status', 'children')],
     [Input('ai-chat-send', 'n_clicks'),
      Input('ai-chat-input', 'n_submit'),
      Input('ai-chat-clear', 'n_clicks')],
     [State('ai-chat-input', 'value'),
-     State('ai-conversation-history', 'data'),
-     State('ai-chat-messages', 'children')],
-    prevent_initial_call=True
+     State('ai-conversation-history', 'data')],
+    **_chat_callback_kwargs
 )
-def handle_chat(send_clicks, n_submit, clear_clicks, message, history, current_messages):
+def handle_chat(send_clicks, n_submit, clear_clicks, message, history):
     """Handle chat interactions with auto-fallback between providers"""
-    from dash import callback_context
-    
-    if not callback_context.triggered:
-        return current_messages, '', history, ''
-    
-    trigger = callback_context.triggered[0]['prop_id']
-    
+    triggered_id = ctx.triggered_id
+    if triggered_id is None:
+        raise PreventUpdate
+
     # Clear chat
-    if 'clear' in trigger:
-        return [], '', [], 'Chat history cleared'
-    
-    # Send message
-    if ('send' in trigger or 'submit' in trigger) and message and message.strip():
-        # Use global AI service with auto-fallback
-        global ai_service
+    if triggered_id == 'ai-chat-clear':
+        return _CLEARED_RETURN
+
+    # Send message (button click or textarea submit)
+    if (triggered_id in ('ai-chat-send', 'ai-chat-input')
+            and message and message.strip()):
+        # Cached AI service with auto-fallback
+        ai_service = get_ai_service()
         if not ai_service.is_available():
-            ai_service = AIService()  # Reinitialize with fallback
-        
+            # Drop the stale instance and rebuild with provider fallback
+            get_ai_service.cache_clear()
+            ai_service = get_ai_service()
+
+        # One timestamp per invocation; chat messages only show HH:MM
+        timestamp = _hhmm()
+
         # Check if service is available
         if not ai_service.is_available():
-            error_msg = format_chat_message(
-                "⚠️ AI service is not configured. Please add your API key to environment variables:\n\n"
-                "- For OpenAI: Set `OPENAI_API_KEY`\n"
-                "- For Anthropic: Set `ANTHROPIC_API_KEY`",
-                is_user=False,
-                timestamp=datetime.now().strftime("%H:%M")
-            )
-            return current_messages + [error_msg], '', history, 'API key missing'
-        
-        # Add user message
-        timestamp = datetime.now().strftime("%H:%M")
-        user_msg = format_chat_message(message, is_user=True, timestamp=timestamp)
-        
-        # Get AI response with auto-fallback
+            new_history = history + [{
+                'role': 'assistant',
+                'content': _NO_API_KEY_MSG,
+                'ts': timestamp,
+                # Rendered locally but excluded from the LLM context
+                'error': True,
+            }]
+            return new_history, '', 'API key missing'
+
+        user_record = {'role': 'user', 'content': message, 'ts': timestamp}
+
+        # Get AI response with auto-fallback, memoized on the exact
+        # (message, history) pair
         try:
-            response = ai_service.chat(message, conversation_history=history)
-            ai_msg = format_chat_message(response, is_user=False, timestamp=datetime.now().strftime("%H:%M"))
-            
-            # Update history
+            api_history = _api_history(history)
+            cache_key = _chat_cache_key(message, api_history)
+            response = _chat_cache.get(cache_key)
+            if response is None:
+                response = _fetch_chat_response(
+                    ai_service, cache_key, message, api_history
+                )
             new_history = history + [
-                {"role": "user", "content": message},
-                {"role": "assistant", "content": response}
+                user_record,
+                {'role': 'assistant', 'content': response, 'ts': timestamp},
             ]
-            
             provider_name = ai_service.provider.value.upper() if ai_service.provider else "AI"
-            return current_messages + [user_msg, ai_msg], '', new_history, f'Response from {provider_name}'
-        
+            return new_history, '', f'Response from {provider_name}'
+
         except Exception as e:
-            error_msg = format_chat_message(
-                f"Sorry, I encountered an error: {str(e)}",
-                is_user=False,
-                timestamp=datetime.now().strftime("%H:%M")
-            )
-            return current_messages + [user_msg, error_msg], '', history, f'Error: {str(e)}'
-    
-    return current_messages, message, history, ''
+            # Keep the failed exchange visible but out of the API
+            # context so a retry re-sends cleanly
+            user_record['error'] = True
+            new_history = history + [
+                user_record,
+                {'role': 'assistant',
+                 'content': f"Sorry, I encountered an error: {str(e)}",
+                 'ts': timestamp, 'error': True},
+            ]
+            return new_history, '', f'Error: {str(e)}'
+
+    # Blank/whitespace input: short-circuit before any serialization
+    raise PreventUpdate
 
 # ============= END AI CHAT CALLBACKS =============
 
 # Expose server for production deployment (Gunicorn, etc.)
 server = app.server
 
+# Compress the JSON/bundle endpoints (_dash-layout, _dash-dependencies,
+# component suites) - several KB of highly compressible text per page
+# load. Optional: the app serves uncompressed if flask-compress is
+# missing.
+try:
+    from flask_compress import Compress
+
+    server.config['COMPRESS_MIMETYPES'] = [
+        'application/json', 'text/html', 'text/css', 'application/javascript'
+    ]
+    server.config['COMPRESS_LEVEL'] = 6
+    server.config['COMPRESS_BR_LEVEL'] = 4
+    Compress(server)
+except ImportError:
+    logger.info("flask-compress not installed; responses served uncompressed")
+
 if __name__ == '__main__':
     print(f"🚀 Starting Health Economic Modeling Hub on {HOST}:{PORT}")
     print(f"📊 Dashboard: http://{HOST}:{PORT}")
@@ -373,7 +645,9 @@ if __name__ == '__main__':
     print(f"💾 Database: Initialized")
     
     try:
-        app.run_server(host=HOST, port=PORT, debug=True)
+        # Debug (reloader + single-threaded dev server) only when
+        # DASH_DEBUG=1; production runs behind Gunicorn via `server`
+        app.run_server(host=HOST, port=PORT, debug=DEBUG, threaded=not DEBUG)
     finally:
         # Clean up database connections on shutdown
         dispose_db()
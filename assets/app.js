@@ -24,6 +24,9 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Add form validation helpers
     setupFormValidation();
+
+    // Stream AI chat tokens for progressive display
+    setupChatStreaming();
 });
 
 /**
@@ -418,4 +421,167 @@ window.healthEconUtils = {
     debounce
 };
 
+/**
+ * Stream assistant tokens from /ai/stream while the Dash callback runs.
+ * The server dedups against the callback's LLM call, so this only adds
+ * progressive display: tokens appear as generated instead of after the
+ * full response. The preview is removed when the callback lands the
+ * final message in the history store.
+ */
+function setupChatStreaming() {
+    document.addEventListener('click', function(e) {
+        if (!e.target.closest('#ai-chat-send')) return;
+        const input = document.getElementById('ai-chat-input');
+        const message = input && input.value ? input.value.trim() : '';
+        if (!message) return;
+
+        let history = [];
+        try {
+            history = JSON.parse(sessionStorage.getItem('ai-conversation-history')) || [];
+        } catch (err) { /* no stored history yet */ }
+
+        streamAssistantPreview(message, history);
+    });
+}
+
+function streamAssistantPreview(message, history) {
+    const container = document.getElementById('ai-chat-messages');
+    if (!container || !window.fetch || !window.ReadableStream) return;
+
+    // Sibling of the messages div so Dash's re-render doesn't fight it
+    let preview = document.getElementById('ai-stream-preview');
+    if (!preview) {
+        preview = document.createElement('div');
+        preview.id = 'ai-stream-preview';
+        preview.className = 'p-3 bg-white border rounded mb-3 text-muted';
+        preview.style.whiteSpace = 'pre-wrap';
+        container.parentNode.insertBefore(preview, container.nextSibling);
+    }
+    preview.textContent = '';
+    preview.style.display = 'block';
+
+    fetch('/ai/stream', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({message: message, history: history})
+    }).then(function(resp) {
+        if (!resp.ok || !resp.body) throw new Error('stream unavailable');
+        const reader = resp.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        function pump() {
+            return reader.read().then(function(result) {
+                if (result.done) {
+                    preview.style.display = 'none';
+                    return;
+                }
+                buffer += decoder.decode(result.value, {stream: true});
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                events.forEach(function(evt) {
+                    if (!evt.startsWith('data: ')) return;
+                    const data = evt.slice(6);
+                    if (data === '[DONE]') {
+                        preview.style.display = 'none';
+                        return;
+                    }
+                    try {
+                        preview.textContent += JSON.parse(data);
+                    } catch (err) { /* partial frame; ignore */ }
+                });
+                container.scrollTop = container.scrollHeight;
+                return pump();
+            });
+        }
+        return pump();
+    }).catch(function() {
+        // Streaming is best-effort; the callback still delivers the reply
+        preview.style.display = 'none';
+    });
+}
+
 console.log('Health Economic Modeling Hub - JavaScript utilities ready');
+
+// ============= AI CHAT CLIENTSIDE RENDERING =============
+// Chat messages are rendered in the browser from the raw
+// {role, content, ts} records in the ai-conversation-history store, so
+// callbacks only ship message deltas instead of the full component tree.
+
+window.dash_clientside = window.dash_clientside || {};
+
+// Rendered message elements keyed by role/timestamp/content, so a new
+// message only builds its own element: earlier entries stay
+// reference-equal across renders and React skips re-parsing their
+// Markdown. Cleared when the transcript shrinks (chat cleared).
+const _aiChatRendered = new Map();
+
+window.dash_clientside.ai_chat = {
+    render_messages: function(history) {
+        if (!history || !history.length) {
+            _aiChatRendered.clear();
+            return [];
+        }
+
+        const el = function(namespace, type, props) {
+            return {namespace: namespace, type: type, props: props};
+        };
+        const html = (type, props) => el('dash_html_components', type, props);
+
+        const build = function(msg) {
+            const ts = msg.ts ? ' • ' + msg.ts : '';
+            if (msg.role === 'user') {
+                return html('Div', {
+                    className: 'mb-3 text-end',
+                    children: [
+                        html('Div', {
+                            className: 'mb-1',
+                            children: [
+                                html('Strong', {className: 'text-primary', children: 'You'}),
+                                html('Span', {className: 'text-muted small', children: ts})
+                            ]
+                        }),
+                        html('Div', {
+                            className: 'p-3 bg-primary text-white rounded',
+                            style: {marginLeft: '20%'},
+                            children: msg.content
+                        })
+                    ]
+                });
+            }
+            return html('Div', {
+                className: 'mb-3',
+                children: [
+                    html('Div', {
+                        className: 'mb-1',
+                        children: [
+                            html('I', {className: 'fas fa-robot text-success me-2'}),
+                            html('Strong', {className: 'text-success', children: 'AI Assistant'}),
+                            html('Span', {className: 'text-muted small', children: ts})
+                        ]
+                    }),
+                    html('Div', {
+                        children: el('dash_core_components', 'Markdown', {
+                            children: msg.content,
+                            className: 'p-3 bg-white border rounded',
+                            style: {marginRight: '20%', whiteSpace: 'pre-wrap'}
+                        })
+                    })
+                ]
+            });
+        };
+
+        return history.map(function(msg) {
+            const key = (msg.role || '') + '|' + (msg.ts || '') + '|' + msg.content;
+            let rendered = _aiChatRendered.get(key);
+            if (!rendered) {
+                rendered = build(msg);
+                _aiChatRendered.set(key, rendered);
+                if (_aiChatRendered.size > 512) {
+                    _aiChatRendered.delete(_aiChatRendered.keys().next().value);
+                }
+            }
+            return rendered;
+        });
+    }
+};
@@ -3,12 +3,21 @@ from dash import html, dcc
 import dash_bootstrap_components as dbc
 
 
+# Built once on first call; the tree is static so debug-mode reloads
+# and repeated layout builds reuse the same components
+_CHAT_LAYOUT = None
+
+
 def create_ai_chat_button():
     """
     Create floating AI chat button (bottom-right corner).
     Returns the button component and modal dialog.
     """
-    
+    global _CHAT_LAYOUT
+    if _CHAT_LAYOUT is not None:
+        return _CHAT_LAYOUT
+
+
     # Floating button (bottom-right) - Icon only
     chat_button = html.Div(
         dbc.Button(
@@ -116,15 +125,19 @@ def create_ai_chat_button():
     )
     
     # Store for conversation history and provider
-    conversation_store = dcc.Store(id='ai-conversation-history', data=[])
+    # Session storage keeps the transcript across page reloads (and lets
+    # repeated questions hit the server-side response cache)
+    conversation_store = dcc.Store(id='ai-conversation-history', data=[],
+                                   storage_type='session')
     provider_store = dcc.Store(id='ai-provider-store', data='openai')  # Auto-fallback handled in backend
     
-    return html.Div([
+    _CHAT_LAYOUT = html.Div([
         chat_button,
         chat_modal,
         conversation_store,
         provider_store
     ])
+    return _CHAT_LAYOUT
 
 
 def format_chat_message(content: str, is_user: bool = True, timestamp: str = None):
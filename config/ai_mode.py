@@ -1,4 +1,5 @@
 """AI Mode Helper - Access current AI mode in callbacks"""
+from functools import lru_cache
 
 # AI Mode Descriptions
 AI_MODES = {
@@ -40,13 +41,27 @@ AI_MODES = {
     }
 }
 
+# Prebuilt lookup structures: these predicates run inside callback hot
+# paths, so membership tests hit module-level frozensets instead of
+# rebuilding list literals on every call
+_AUTO_FILL_MODES = frozenset({'ai-augmented', 'ai-automated'})
+_SUGGESTION_MODES = frozenset({'ai-assisted', 'ai-augmented'})
+_ASSISTANCE_LEVELS = {
+    'ai-assisted': 'Low - Suggestions only',
+    'ai-augmented': 'Medium - Active help',
+    'ai-automated': 'High - Full automation'
+}
+
+# Memoized: the UI mode rarely changes between callback invocations,
+# so repeat calls skip the dict lookups and default resolution entirely
+@lru_cache(maxsize=8)
 def get_ai_mode_config(mode: str) -> dict:
     """Get configuration for specified AI mode"""
-    return AI_MODES.get(mode, AI_MODES['ai-assisted'])
+    return AI_MODES.get(mode) or AI_MODES['ai-assisted']
 
 def should_auto_fill(mode: str) -> bool:
     """Check if AI should auto-fill parameters"""
-    return mode in ['ai-augmented', 'ai-automated']
+    return mode in _AUTO_FILL_MODES
 
 def should_auto_analyze(mode: str) -> bool:
     """Check if AI should automatically run analyses"""
@@ -54,7 +69,7 @@ def should_auto_analyze(mode: str) -> bool:
 
 def should_show_suggestions(mode: str) -> bool:
     """Check if AI should show suggestions"""
-    return mode in ['ai-assisted', 'ai-augmented']
+    return mode in _SUGGESTION_MODES
 
 def should_validate_inputs(mode: str) -> bool:
     """Check if AI should validate inputs"""
@@ -62,9 +77,4 @@ def should_validate_inputs(mode: str) -> bool:
 
 def get_ai_assistance_level(mode: str) -> str:
     """Get assistance level description"""
-    levels = {
-        'ai-assisted': 'Low - Suggestions only',
-        'ai-augmented': 'Medium - Active help',
-        'ai-automated': 'High - Full automation'
-    }
-    return levels.get(mode, 'Low')
+    return _ASSISTANCE_LEVELS.get(mode, 'Low')
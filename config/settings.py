@@ -1,11 +1,26 @@
 """Configuration settings for the Dash application"""
 import os
 
+__all__ = [
+    'APP_TITLE', 'VERSION', 'HOST', 'PORT', 'DEBUG',
+    'THEME',
+    'DATABASE_URL', 'DB_POOL_SIZE', 'DB_MAX_OVERFLOW',
+    'DB_POOL_TIMEOUT', 'DB_POOL_RECYCLE',
+    'OPENAI_API_KEY', 'OPENAI_MODEL',
+    'ANTHROPIC_API_KEY', 'ANTHROPIC_MODEL',
+    'DEFAULT_DISCOUNT_RATE', 'DEFAULT_WTP_THRESHOLD', 'MAX_TIME_HORIZON',
+    'DEFAULT_AI_MODE', 'AI_MODES',
+    'CHART_CONFIG',
+]
+
 # Application Settings
 APP_TITLE = "Health Economic Modeling Hub"
 VERSION = "1.0.0"
 HOST = os.getenv("HOST", "0.0.0.0")  # Use 0.0.0.0 for production
 PORT = int(os.getenv("PORT", 8050))
+# Debug mode is opt-in; the dev server's reloader and single-threaded
+# serving must never run in production
+DEBUG = os.getenv("DASH_DEBUG", "0") == "1"
 
 # Theme Settings
 THEME = {
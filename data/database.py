@@ -1,17 +1,53 @@
 """
 Database Module - SQLite database for storing projects and models
 """
+import atexit
 import sqlite3
 import json
+import threading
+from functools import lru_cache
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 DATABASE_PATH = "health_econ_hub.db"
 
+# One connection per thread, opened lazily and reused: reconnecting per
+# call re-opens the file and re-reads the schema header every time. WAL
+# lets readers and the writer overlap across Gunicorn worker threads.
+_conn_local = threading.local()
+_open_conns = []
+_open_conns_lock = threading.Lock()
+
+def _get_conn() -> sqlite3.Connection:
+    """Get (or lazily create) this thread's cached connection"""
+    conn = getattr(_conn_local, 'conn', None)
+    if conn is None:
+        # Autocommit mode: each statement commits on its own, matching
+        # the one-statement-per-call usage below
+        conn = sqlite3.connect(DATABASE_PATH, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        conn.execute('PRAGMA cache_size=-64000')
+        _conn_local.conn = conn
+        with _open_conns_lock:
+            _open_conns.append(conn)
+    return conn
+
+@atexit.register
+def _close_connections():
+    with _open_conns_lock:
+        for conn in _open_conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _open_conns.clear()
+
 def init_database():
     """Initialize database with required tables"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     # Projects table
     cursor.execute('''
@@ -80,114 +116,165 @@ def init_database():
             FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
         )
     ''')
-    
-    conn.commit()
-    conn.close()
 
 # Initialize database on import
 init_database()
 
+# Read cache: project rows are re-fetched by many callbacks per page
+# render, so repeated reads come from a dict instead of SQLite. Writers
+# invalidate the touched id and bump the list version; a plain dict is
+# used instead of lru_cache so single entries can be evicted.
+_project_cache: Dict[int, Dict[str, Any]] = {}
+_project_cache_lock = threading.Lock()
+_PROJECT_CACHE_MAX = 256
+_projects_version = 0
+_all_projects_cache: tuple = (-1, None)  # (version, rows)
+
+def _invalidate_project(project_id: Optional[int] = None):
+    """Drop cached reads after a write; None clears only the list"""
+    global _projects_version
+    with _project_cache_lock:
+        if project_id is not None:
+            _project_cache.pop(project_id, None)
+        _projects_version += 1
+
 # Project Functions
 def get_all_projects() -> List[Dict[str, Any]]:
     """Get all projects from database"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
+    global _all_projects_cache
+    with _project_cache_lock:
+        cached_version, rows = _all_projects_cache
+        if cached_version == _projects_version:
+            # Copies, not the cached dicts themselves: callers mutate
+            # the plain dicts they get back, which must never reach
+            # other readers through the cache
+            return [dict(p) for p in rows]
+        # Remember which version this SELECT will observe; a write that
+        # lands while we query must win over our then-stale rows
+        version = _projects_version
+
+    cursor = _get_conn().cursor()
+    # Raw tuples + one description read: dict(Row) rescans column names
+    # per field, which is quadratic in columns for every row
+    cursor.row_factory = None
     cursor.execute('SELECT * FROM projects ORDER BY updated_date DESC')
-    rows = cursor.fetchall()
-    
-    projects = [dict(row) for row in rows]
-    conn.close()
-    
-    return projects
+    cols = [d[0] for d in cursor.description]
+    projects = [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+    with _project_cache_lock:
+        if version == _projects_version:
+            _all_projects_cache = (version, projects)
+    return [dict(p) for p in projects]
 
 def create_project(name: str, description: str, model_type: str) -> int:
     """Create a new project"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
+    cursor = _get_conn().cursor()
     cursor.execute('''
         INSERT INTO projects (name, description, model_type, status, created_date, updated_date)
         VALUES (?, ?, ?, 'draft', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
     ''', (name, description, model_type))
-    
-    project_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
-    return project_id
+    _invalidate_project()
+    return cursor.lastrowid
+
+def create_projects(rows: List[tuple]) -> int:
+    """Bulk-create projects from (name, description, model_type) tuples.
+
+    Runs as one executemany inside a single explicit transaction, so a
+    batch pays one WAL sync instead of one per row."""
+    cursor = _get_conn().cursor()
+    cursor.execute('BEGIN')
+    try:
+        cursor.executemany('''
+            INSERT INTO projects (name, description, model_type, status, created_date, updated_date)
+            VALUES (?, ?, ?, 'draft', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        ''', rows)
+        inserted = cursor.rowcount
+        cursor.execute('COMMIT')
+    except Exception:
+        cursor.execute('ROLLBACK')
+        raise
+    _invalidate_project()
+    return inserted
 
 def get_project(project_id: int) -> Optional[Dict[str, Any]]:
     """Get a single project by ID"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
+    with _project_cache_lock:
+        cached = _project_cache.get(project_id)
+        if cached is not None:
+            # Copy so caller mutations can't corrupt the cached entry
+            return dict(cached)
+        version = _projects_version
+
+    cursor = _get_conn().cursor()
     cursor.execute('SELECT * FROM projects WHERE id = ?', (project_id,))
     row = cursor.fetchone()
-    
-    project = dict(row) if row else None
-    conn.close()
-    
-    return project
+    if row is None:
+        return None
+
+    project = dict(row)
+    with _project_cache_lock:
+        # Only cache if no write landed since the SELECT started; a
+        # concurrent update/delete has already invalidated this id and
+        # re-inserting would undo that
+        if version == _projects_version:
+            if len(_project_cache) >= _PROJECT_CACHE_MAX:
+                _project_cache.pop(next(iter(_project_cache)))
+            _project_cache[project_id] = project
+    return dict(project)
+
+@lru_cache(maxsize=64)
+def _build_update_sql(keys: tuple) -> str:
+    """SQL for an UPDATE touching the given columns.
+
+    Memoized by the sorted key shape so repeat updates reuse the same
+    SQL string and hit SQLite's per-connection statement cache instead
+    of re-parsing and re-planning a fresh string each call."""
+    assignments = ', '.join(f'{key} = ?' for key in keys)
+    return (f'UPDATE projects SET {assignments}, '
+            f'updated_date = CURRENT_TIMESTAMP WHERE id = ?')
 
 def update_project(project_id: int, **kwargs) -> bool:
     """Update a project"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Build update query dynamically
-    fields = []
-    values = []
-    for key, value in kwargs.items():
-        fields.append(f"{key} = ?")
-        values.append(value)
-    
-    fields.append("updated_date = CURRENT_TIMESTAMP")
-    values.append(project_id)
-    
-    query = f"UPDATE projects SET {', '.join(fields)} WHERE id = ?"
-    cursor.execute(query, values)
-    
-    success = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    
-    return success
+    cursor = _get_conn().cursor()
+
+    if not kwargs:
+        # No columns requested: touch updated_date only, as the
+        # baseline did (the shape-keyed builder needs at least one key)
+        cursor.execute(
+            'UPDATE projects SET updated_date = CURRENT_TIMESTAMP '
+            'WHERE id = ?',
+            (project_id,)
+        )
+    else:
+        keys = tuple(sorted(kwargs))
+        values = [kwargs[key] for key in keys]
+        values.append(project_id)
+        cursor.execute(_build_update_sql(keys), values)
+
+    _invalidate_project(project_id)
+    return cursor.rowcount > 0
 
 def delete_project(project_id: int) -> bool:
     """Delete a project"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
+    cursor = _get_conn().cursor()
     cursor.execute('DELETE FROM projects WHERE id = ?', (project_id,))
-    
-    success = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    
-    return success
+    _invalidate_project(project_id)
+    return cursor.rowcount > 0
 
 def get_project_count() -> Dict[str, int]:
     """Get counts of projects by type"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT COUNT(*) FROM projects')
-    total = cursor.fetchone()[0]
-    
-    cursor.execute('SELECT COUNT(*) FROM decision_trees')
-    decision_trees = cursor.fetchone()[0]
-    
-    cursor.execute('SELECT COUNT(*) FROM markov_models')
-    markov_models = cursor.fetchone()[0]
-    
-    cursor.execute('SELECT COUNT(*) FROM psm_models')
-    psm_models = cursor.fetchone()[0]
-    
-    conn.close()
-    
+    cursor = _get_conn().cursor()
+
+    # One statement instead of four round-trips; SQLite evaluates all
+    # four counts in a single prepared query
+    cursor.execute('''
+        SELECT (SELECT COUNT(*) FROM projects),
+               (SELECT COUNT(*) FROM decision_trees),
+               (SELECT COUNT(*) FROM markov_models),
+               (SELECT COUNT(*) FROM psm_models)
+    ''')
+    total, decision_trees, markov_models, psm_models = cursor.fetchone()
+
     return {
         'total': total,
         'decision_trees': decision_trees,
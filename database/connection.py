@@ -5,10 +5,19 @@ from sqlalchemy.orm import sessionmaker, scoped_session
 from contextlib import contextmanager
 import logging
 
+from config.settings import (
+    DATABASE_URL as _CONFIGURED_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+)
+
 logger = logging.getLogger(__name__)
 
-# Get database URL from environment variable or use SQLite as fallback
-DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///health_econ_hub.db')
+# Single source of truth for the URL and pool tunables is
+# config.settings; env vars are parsed exactly once there
+DATABASE_URL = _CONFIGURED_URL
 
 # PostgreSQL connection string fix for SQLAlchemy 2.0
 if DATABASE_URL.startswith('postgres://'):
@@ -24,10 +33,10 @@ if DATABASE_URL.startswith('postgresql://'):
     # PostgreSQL specific configuration
     engine_kwargs.update({
         'poolclass': pool.QueuePool,
-        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
-        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
-        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
-        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 3600)),
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
         'pool_pre_ping': True,  # Verify connections before using
     })
 elif DATABASE_URL.startswith('sqlite://'):
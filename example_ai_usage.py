@@ -37,7 +37,7 @@ def example_automated_workflow():
     print("Running automated workflow...\n")
     
     # Run complete workflow
-    result = graph.run(user_query=query)
+    result = graph.run_sync(user_query=query)
     
     # Display results
     print("\n" + "=" * 80)
@@ -46,7 +46,7 @@ def example_automated_workflow():
     print(f"\nProject: {result.get('project_name', 'N/A')}")
     print(f"Disease Area: {result.get('disease_area', 'N/A')}")
     print(f"Model Type: {result.get('model_type', 'N/A')}")
-    print(f"Time Horizon: {result.get('time_horizon', 'N/A')} years")
+    print(f"Time Horizon: {result.get('meta', {}).get('time_horizon', 'N/A')} years")
     
     if result.get('base_case_results'):
         base = result['base_case_results']
@@ -60,9 +60,12 @@ def example_automated_workflow():
         print(f"\nDSA: Analyzed {len(result['dsa_results'].get('tornado_data', []))} parameters")
     
     if result.get('psa_results'):
-        print(f"\nPSA: Ran {len(result['psa_results'].get('simulations', []))} simulations")
+        # The vectorized PSA reports summary arrays rather than per-draw
+        # records; the scatter points carry one entry per simulation
+        n_sims = len(result['psa_results'].get('scatter_data', {}).get('costs', []))
+        print(f"\nPSA: Ran {n_sims} simulations")
     
-    print(f"\nFinal Report: {len(result.get('final_report', ''))} characters\n")
+    print(f"\nFinal Report: {len(''.join(result.get('final_report_parts', [])))} characters\n")
 
 
 def example_interactive_workflow():
@@ -83,7 +86,7 @@ def example_interactive_workflow():
     print("Running workflow until approval checkpoint...\n")
     
     # Run until approval is needed
-    result = graph.run_until_approval(user_query=query)
+    result = graph.run_until_approval_sync(user_query=query)
     
     # Display validation results
     print("\n" + "=" * 80)
@@ -128,7 +131,7 @@ def example_interactive_workflow():
         print("Resuming workflow...\n")
         
         # Continue workflow after approval
-        final_result = graph.resume_after_approval(result, approved=True)
+        final_result = graph.resume_after_approval_sync(result, approved=True)
         
         print("\n" + "=" * 80)
         print("FINAL RESULTS")
@@ -227,13 +230,13 @@ def example_direct_crew_usage():
     )
     
     print("Literature Research Results:")
-    print(f"  Parameters found: {len(result.get('parameters', {}))}")
-    print(f"  Sources: {len(result.get('sources', []))}")
-    print(f"  Missing: {len(result.get('missing_parameters', []))}")
+    print(f"  Parameters found: {len(result.parameters)}")
+    print(f"  Sources: {len(result.sources)}")
+    print(f"  Missing: {len(result.missing_parameters)}")
     
-    if result.get('parameters'):
+    if result.parameters:
         print("\n  Sample Parameters:")
-        for key, value in list(result['parameters'].items())[:3]:
+        for key, value in list(result.parameters.items())[:3]:
             if isinstance(value, dict):
                 print(f"    - {key}: {value.get('value', 'N/A')} (Source: {value.get('source', 'N/A')})")
     
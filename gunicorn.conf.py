@@ -0,0 +1,19 @@
+"""Gunicorn configuration for production deployment
+
+Run with: gunicorn -c gunicorn.conf.py app:server
+"""
+import os
+
+from config.settings import HOST, PORT
+
+bind = f"{HOST}:{PORT}"
+
+# Threaded workers: Dash callbacks are I/O-bound (database, LLM APIs),
+# so a few threads per worker multiplex waits without extra processes
+workers = 2 * (os.cpu_count() or 1) + 1
+worker_class = "gthread"
+threads = 4
+
+# Import the app once in the master so forked workers share the cached
+# layout JSON, route tables and database pool setup via copy-on-write
+preload_app = True